@@ -0,0 +1,263 @@
+"""
+Fallback DSP Kernels
+
+This module provides a small set of audio kernels compiled with Numba.
+The effect kernels stand in for Pedalboard in the advanced effects
+module, and the main processing, denoise and export paths use the
+dynamics, spectral and PCM kernels whenever Numba is available. The
+effect kernels operate in place on planar float32 buffers of shape
+(channels, samples). Numba's CPU target has no float16 arithmetic, so
+half-precision audio has to be widened to float32 before calling them.
+"""
+
+import os
+import math
+import logging
+from typing import Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Import Numba for JIT-compiled sample loops
+    from numba import config as numba_config, njit, prange
+    NUMBA_AVAILABLE = True
+
+    # Prefer OpenMP for the parallel kernels: the TBB layer can deadlock at
+    # interpreter exit once other thread pools have run in the process
+    if 'NUMBA_THREADING_LAYER' not in os.environ:
+        numba_config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+except ImportError:
+    logger.warning("Numba not installed. Fallback DSP kernels will not be available.")
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so the kernels can still be defined"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def apply_gain(buf, gain):
+    """Multiply every sample by a linear gain"""
+    channels, samples = buf.shape
+    for c in range(channels):
+        for i in range(samples):
+            buf[c, i] *= gain
+
+
+@njit(cache=True, fastmath=True)
+def biquad(buf, b0, b1, b2, a1, a2):
+    """Run a normalized biquad (a0 == 1) over each channel, transposed direct form II"""
+    channels, samples = buf.shape
+    for c in range(channels):
+        z1 = 0.0
+        z2 = 0.0
+        for i in range(samples):
+            x = buf[c, i]
+            y = b0 * x + z1
+            z1 = b1 * x - a1 * y + z2
+            z2 = b2 * x - a2 * y
+            buf[c, i] = y
+
+
+@njit(cache=True, fastmath=True)
+def soft_clip(buf, drive):
+    """Tanh saturation with the given linear drive"""
+    channels, samples = buf.shape
+    for c in range(channels):
+        for i in range(samples):
+            buf[c, i] = math.tanh(buf[c, i] * drive)
+
+
+@njit(cache=True, fastmath=True)
+def comb_delay(buf, delay_samples, feedback, mix):
+    """Feedback comb delay mixed with the dry signal"""
+    channels, samples = buf.shape
+    line = np.zeros(delay_samples, dtype=buf.dtype)
+    for c in range(channels):
+        line[:] = 0.0
+        pos = 0
+        for i in range(samples):
+            x = buf[c, i]
+            delayed = line[pos]
+            line[pos] = x + feedback * delayed
+            buf[c, i] = (1.0 - mix) * x + mix * delayed
+            pos += 1
+            if pos == delay_samples:
+                pos = 0
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def compressor(buf, threshold, inv_ratio_minus_1, attack_samples, release_samples):
+    """
+    Feed-forward compressor with per-sample attack/release smoothing of the
+    gain; the first sample of each channel takes its target gain directly.
+    Channels run in parallel
+    """
+    channels, samples = buf.shape
+    attack_step = 1.0 / attack_samples
+    release_step = 1.0 / release_samples
+    for c in prange(channels):
+        gain = 1.0
+        for i in range(samples):
+            level = abs(buf[c, i])
+            if level > threshold:
+                target = (level / threshold) ** inv_ratio_minus_1
+            else:
+                target = 1.0
+            if i == 0:
+                gain = target
+            elif target < gain:
+                gain += (target - gain) * attack_step
+            else:
+                gain += (target - gain) * release_step
+            buf[c, i] *= gain
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def limiter(buf, threshold, release_samples):
+    """
+    Peak limiter: the gain drops instantly to threshold / level and recovers
+    towards unity with a one-pole release; the first sample of each channel
+    takes its target gain directly. Channels run in parallel
+    """
+    channels, samples = buf.shape
+    release_step = 1.0 / release_samples
+    for c in prange(channels):
+        gain = 1.0
+        for i in range(samples):
+            level = abs(buf[c, i])
+            if level > threshold:
+                target = threshold / level
+            else:
+                target = 1.0
+            if i == 0:
+                gain = target
+            else:
+                gain = min(gain + (1.0 - gain) * release_step, target)
+            buf[c, i] *= gain
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def gate(buf, threshold, ratio, attack_samples, release_samples):
+    """
+    Downward expander: samples below threshold are scaled by
+    (level / threshold) ** ratio through the same attack/release smoothing
+    as compressor. The gain recurrence is sequential within a channel, so
+    only the channel loop may run in parallel
+    """
+    channels, samples = buf.shape
+    attack_step = 1.0 / attack_samples
+    release_step = 1.0 / release_samples
+    for c in prange(channels):
+        gain = 1.0
+        for i in range(samples):
+            level = abs(buf[c, i])
+            if level < threshold:
+                target = (level / threshold) ** ratio
+            else:
+                target = 1.0
+            if i == 0:
+                gain = target
+            elif target < gain:
+                gain += (target - gain) * attack_step
+            else:
+                gain += (target - gain) * release_step
+            buf[c, i] *= gain
+
+
+@njit(parallel=True, cache=True, fastmath=True, boundscheck=False)
+def stereo_width(buf, direct, cross):
+    """
+    Remix a (2, samples) buffer in place as left' = direct * left +
+    cross * right and right' = cross * left + direct * right, the mid/side
+    width change folded into one pass; samples run in parallel
+    """
+    for i in prange(buf.shape[1]):
+        left = buf[0, i]
+        right = buf[1, i]
+        buf[0, i] = direct * left + cross * right
+        buf[1, i] = cross * left + direct * right
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def spectral_gate(stft, kth, factor):
+    """
+    Zero the bins of each frequency row at or below factor times the row's
+    kth-smallest magnitude, in place; rows are processed in parallel
+    """
+    bins, frames = stft.shape
+    for f in prange(bins):
+        magnitude = np.abs(stft[f])
+        threshold = np.partition(magnitude, kth)[kth] * factor
+        for t in range(frames):
+            if magnitude[t] <= threshold:
+                stft[f, t] = 0
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def quantize_pcm(samples, scale, shift, out):
+    """
+    Scale, floor, clip and cast flat float samples to integers in one pass,
+    writing (value << shift) into out; blocks of samples run in parallel
+    """
+    for i in prange(samples.size):
+        v = math.floor(np.float32(samples[i]) * scale)
+        if v < -scale:
+            v = -scale
+        elif v > scale - 1:
+            v = scale - 1
+        out[i] = int(v) << shift
+
+
+def design_biquad(kind: str, cutoff_hz: float, sample_rate: int,
+                  gain_db: float = 0.0, q: float = 0.707) -> Tuple[float, float, float, float, float]:
+    """
+    Design normalized biquad coefficients (RBJ audio EQ cookbook)
+
+    Args:
+        kind: Filter kind ('lowpass', 'highpass', 'bandpass', 'peak',
+            'low_shelf' or 'high_shelf')
+        cutoff_hz: Cutoff or centre frequency in Hz
+        sample_rate: Sample rate in Hz
+        gain_db: Gain in dB (peak and shelf filters only)
+        q: Quality factor
+
+    Returns:
+        Tuple of (b0, b1, b2, a1, a2) normalized so that a0 == 1
+    """
+    w0 = 2.0 * math.pi * min(cutoff_hz, 0.49 * sample_rate) / sample_rate
+    cos_w0 = math.cos(w0)
+    alpha = math.sin(w0) / (2.0 * q)
+    amp = 10.0 ** (gain_db / 40.0)
+
+    if kind == 'lowpass':
+        b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+        a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    elif kind == 'highpass':
+        b = ((1 + cos_w0) / 2, -(1 + cos_w0), (1 + cos_w0) / 2)
+        a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    elif kind == 'bandpass':
+        b = (alpha, 0.0, -alpha)
+        a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+    elif kind == 'peak':
+        b = (1 + alpha * amp, -2 * cos_w0, 1 - alpha * amp)
+        a = (1 + alpha / amp, -2 * cos_w0, 1 - alpha / amp)
+    elif kind in ('low_shelf', 'high_shelf'):
+        sqrt_amp_alpha = 2 * math.sqrt(amp) * alpha
+        sign = 1 if kind == 'low_shelf' else -1
+        b = (amp * ((amp + 1) - sign * (amp - 1) * cos_w0 + sqrt_amp_alpha),
+             sign * 2 * amp * ((amp - 1) - sign * (amp + 1) * cos_w0),
+             amp * ((amp + 1) - sign * (amp - 1) * cos_w0 - sqrt_amp_alpha))
+        a = ((amp + 1) + sign * (amp - 1) * cos_w0 + sqrt_amp_alpha,
+             -sign * 2 * ((amp - 1) + sign * (amp + 1) * cos_w0),
+             (amp + 1) + sign * (amp - 1) * cos_w0 - sqrt_amp_alpha)
+    else:
+        raise ValueError(f"Unsupported biquad kind: {kind}")
+
+    a0 = a[0]
+    return b[0] / a0, b[1] / a0, b[2] / a0, a[1] / a0, a[2] / a0
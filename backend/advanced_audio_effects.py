@@ -5,30 +5,349 @@ This module provides high-quality audio effects using the Pedalboard library,
 which is built on professional-grade audio DSP algorithms.
 """
 
+import importlib.util
+import math
+import os
 import numpy as np
+import scipy.fft
+import scipy.signal
+import soundfile as sf
 import logging
-from typing import Dict, Any, Tuple, Optional, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Tuple, Optional, List, Callable, Iterable, Iterator
+
+import _fallback_dsp as fallback_dsp
 
 logger = logging.getLogger(__name__)
 
-try:
-    # Import Pedalboard for high-quality audio effects
-    from pedalboard import Pedalboard, Compressor, Reverb, Delay, Gain, Distortion
-    from pedalboard import Chorus, Phaser, LadderFilter, PitchShift
-    from pedalboard.io import AudioFile
-    PEDALBOARD_AVAILABLE = True
-except ImportError:
+# Upper bound on cached plugin instances / boards before the caches are flushed
+_CACHE_MAX_ENTRIES = 256
+
+# Frames per processing block; 8192 stereo float32 frames (64 KiB) stay in L2
+_DEFAULT_BLOCK_SIZE = 8192
+
+# Default effect parameters, keyed by the names used in effect chains
+# (single-ended filters default their cutoff to 1 kHz instead)
+_COMPRESSOR_DEFAULTS = {'threshold': -20, 'ratio': 4, 'attack': 20, 'release': 250}
+_REVERB_DEFAULTS = {'room_size': 0.5, 'damping': 0.5, 'wet_level': 0.33,
+                    'dry_level': 0.7, 'width': 1.0, 'freeze_mode': 0.0}
+_DELAY_DEFAULTS = {'time': 0.25, 'feedback': 0.3, 'mix': 0.3}
+_CHORUS_DEFAULTS = {'rate': 1.0, 'depth': 0.25, 'delay': 7.0, 'feedback': 0.0, 'mix': 0.5}
+_PHASER_DEFAULTS = {'rate': 1.0, 'depth': 0.5, 'center_freq': 1300, 'feedback': 0.0, 'mix': 0.5}
+_FILTER_DEFAULTS = {'type': 'bandpass', 'cutoff_low': 500, 'cutoff_high': 3000, 'resonance': 0.7}
+
+# Effects that never mix channels, so each channel can be processed separately
+_CHANNEL_INDEPENDENT_EFFECTS = frozenset({'gain', 'compression', 'distortion', 'eq', 'filter', 'pitch_shift'})
+
+# Minimum buffer length (seconds) before channels are processed in parallel
+_PARALLEL_MIN_SECONDS = 5.0
+
+# Supported channel layouts for multi-channel input to process_with_pedalboard
+_LAYOUTS = ('samples_channels', 'channels_samples')
+
+# Canonical layout for all processing in this module: C-contiguous float32
+# shaped (channels, samples), as Pedalboard and the fallback kernels take it.
+# Other layouts are converted only at the public boundary (process_with_pedalboard).
+# Spectral paths (denoise, harmonies) also run in float32 / complex64.
+_DTYPE = np.float32
+
+# STFT frame and hop length for the spectral-gating denoiser
+_DENOISE_N_FFT = 2048
+_DENOISE_HOP = 512
+
+# Bytes of spectrogram gated per tile by the NumPy denoise path (fits in L2)
+_DENOISE_TILE_BYTES = 262144
+
+# Silent frames run through each Spleeter model when it is first loaded
+_SEPARATOR_WARMUP_SAMPLES = 16000
+
+# Chunk length and per-side context (seconds) used when separating long signals
+_SEPARATION_CHUNK_SECONDS = 30
+_SEPARATION_LOOKAHEAD_SECONDS = 2.0
+
+# Frames per chunk for stream_pedalboard / stream_file
+_STREAM_CHUNK_SAMPLES = 4096
+
+# Block length (seconds) process_stream reads at a time
+_STREAM_BLOCK_SECONDS = 30
+
+# Streams that cannot carry effect state across calls are processed in
+# independent blocks (see AdvancedAudioEffects._stream_blocks). Each block
+# re-reads enough preceding input for the effect tails to decay below
+# _STREAM_TAIL_LEVEL (-80 dB), capped at _STREAM_MAX_CONTEXT_SECONDS, plus
+# _STREAM_OVERLAP frames for the filters to settle; consecutive blocks are
+# crossfaded over _STREAM_CROSSFADE frames.
+_STREAM_OVERLAP = 2048
+_STREAM_TAIL_LEVEL = 1e-4
+_STREAM_MAX_CONTEXT_SECONDS = 10
+_STREAM_CROSSFADE = 1024
+
+# Context (seconds) a pitch shifter needs to settle
+_PITCH_SHIFT_CONTEXT_SECONDS = 0.25
+
+# Effects whose Pedalboard plugins have latency. Pedalboard drops and
+# misaligns their output when state is carried across process() calls
+# (reset=False), so streams through them are processed in independent blocks.
+_LATENCY_EFFECTS = frozenset({'pitch_shift'})
+
+# Longest comb filter (samples at 44.1 kHz) of Pedalboard's Freeverb-based
+# reverb, and the mapping of room_size to its comb feedback
+_FREEVERB_MAX_COMB = 1617
+_FREEVERB_FEEDBACK_OFFSET = 0.7
+_FREEVERB_FEEDBACK_SCALE = 0.28
+
+# Shared stand-in for a missing 'parameters' entry; never mutated
+_EMPTY: Dict[str, Any] = {}
+
+# Source of the specialized entry point generated by compile_runner(); the
+# board's process method is bound as a default so a call is a single
+# Pedalboard.process with no chain dispatch
+_RUNNER_SOURCE = """
+def run(audio_data, sample_rate, _process=board.process, _newaxis=np.newaxis):
+    if audio_data.ndim == 1:
+        return _process(audio_data[_newaxis, :], sample_rate)[0]
+    return _process(audio_data, sample_rate)
+"""
+
+# EQ bands as (parameter name, Pedalboard biquad plugin, cutoff in Hz)
+_EQ_TABLE = [
+    ('low', 'LowShelfFilter', 250),
+    ('low_mid', 'PeakFilter', 500),
+    ('mid', 'PeakFilter', 1000),
+    ('high_mid', 'PeakFilter', 2500),
+    ('high', 'HighShelfFilter', 5000),
+]
+
+# Q shared by every EQ band
+_EQ_Q = 0.7
+
+# Pedalboard EQ plugins -> equivalent fallback biquad kinds
+_FALLBACK_EQ_KINDS = {'LowShelfFilter': 'low_shelf', 'PeakFilter': 'peak', 'HighShelfFilter': 'high_shelf'}
+
+# EQ gains at or below this magnitude (in dB) are treated as flat
+_EQ_GAIN_EPSILON_DB = 0.05
+
+# Pedalboard is only located here; the library itself (and its JUCE shared
+# object) is imported the first time an effect class is needed
+PEDALBOARD_AVAILABLE = importlib.util.find_spec('pedalboard') is not None
+if not PEDALBOARD_AVAILABLE:
     logger.warning("Pedalboard library not installed. Falling back to basic effects.")
-    PEDALBOARD_AVAILABLE = False
+
+# Pedalboard classes resolved so far, by name
+_EFFECT_CLS: Dict[str, Any] = {}
+
+def _cls(name: str) -> Any:
+    """Return a Pedalboard class by name, importing Pedalboard on first use"""
+    global PEDALBOARD_AVAILABLE
+    effect_cls = _EFFECT_CLS.get(name)
+    if effect_cls is None:
+        try:
+            import pedalboard
+        except ImportError as e:
+            # Installed but not loadable (e.g. a missing shared library);
+            # instances created from now on use the fallback effects
+            PEDALBOARD_AVAILABLE = False
+            logger.warning("Pedalboard could not be imported (%s). Falling back to basic effects.", e)
+            raise
+        effect_cls = _EFFECT_CLS[name] = getattr(pedalboard, name)
+    return effect_cls
+
+# Plugin makers. Each takes the effect's parameters as a hashable tuple of
+# (name, value) pairs so that AdvancedAudioEffects can wrap it in lru_cache.
+
+def _make_compressor(key: tuple) -> "Compressor":
+    """Create a compressor effect"""
+    p = {**_COMPRESSOR_DEFAULTS, **dict(key)}
+    return _cls('Compressor')(
+        threshold_db=p['threshold'],
+        ratio=p['ratio'],
+        attack_ms=p['attack'],
+        release_ms=p['release']
+    )
+
+def _make_reverb(key: tuple) -> "Reverb":
+    """Create a reverb effect"""
+    p = {**_REVERB_DEFAULTS, **dict(key)}
+    return _cls('Reverb')(
+        room_size=p['room_size'],
+        damping=p['damping'],
+        wet_level=p['wet_level'],
+        dry_level=p['dry_level'],
+        width=p['width'],
+        freeze_mode=p['freeze_mode']
+    )
+
+def _make_delay(key: tuple) -> "Delay":
+    """Create a delay effect"""
+    p = {**_DELAY_DEFAULTS, **dict(key)}
+    return _cls('Delay')(
+        delay_seconds=p['time'],
+        feedback=p['feedback'],
+        mix=p['mix']
+    )
+
+@lru_cache(maxsize=64)
+def _drive_to_db(drive: float) -> float:
+    """Convert a linear distortion drive to dB"""
+    return 20.0 * math.log10(drive)
+
+def _make_distortion(key: tuple) -> "Distortion":
+    """Create a distortion effect"""
+    return _cls('Distortion')(drive_db=_drive_to_db(dict(key).get('drive', 2.0)))
+
+def _make_chorus(key: tuple) -> "Chorus":
+    """Create a chorus effect"""
+    p = {**_CHORUS_DEFAULTS, **dict(key)}
+    return _cls('Chorus')(
+        rate_hz=p['rate'],
+        depth=p['depth'],
+        centre_delay_ms=p['delay'],
+        feedback=p['feedback'],
+        mix=p['mix']
+    )
+
+def _make_phaser(key: tuple) -> "Phaser":
+    """Create a phaser effect"""
+    p = {**_PHASER_DEFAULTS, **dict(key)}
+    return _cls('Phaser')(
+        rate_hz=p['rate'],
+        depth=p['depth'],
+        centre_frequency_hz=p['center_freq'],
+        feedback=p['feedback'],
+        mix=p['mix']
+    )
+
+def _make_filter(key: tuple) -> "LadderFilter":
+    """Create a filter effect"""
+    params = dict(key)
+    p = {**_FILTER_DEFAULTS, **params}
+    filter_type = p['type']
+    
+    if filter_type == 'lowpass':
+        mode = _cls('LadderFilter').Mode.LPF12
+        cutoff = params.get('cutoff_high', 1000)
+    elif filter_type == 'highpass':
+        mode = _cls('LadderFilter').Mode.HPF12
+        cutoff = params.get('cutoff_low', 1000)
+    else:  # bandpass
+        mode = _cls('LadderFilter').Mode.BPF12
+        cutoff = (p['cutoff_low'] + p['cutoff_high']) / 2
+    
+    return _cls('LadderFilter')(
+        mode=mode,
+        cutoff_hz=cutoff,
+        resonance=p['resonance']
+    )
+
+def _make_gain(key: tuple) -> "Gain":
+    """Create a gain effect"""
+    return _cls('Gain')(gain_db=dict(key).get('gain_db', 0))
+
+def _make_pitch_shift(key: tuple) -> "PitchShift":
+    """Create a pitch shift effect"""
+    return _cls('PitchShift')(semitones=dict(key).get('semitones', 0))
+
+def _make_eq_band(key: tuple) -> Any:
+    """Create the biquad for one EQ band; key holds plugin, cutoff_hz and gain_db"""
+    p = dict(key)
+    return _cls(p['plugin'])(
+        cutoff_frequency_hz=p['cutoff_hz'],
+        gain_db=p['gain_db'],
+        q=_EQ_Q
+    )
+
+# Effect type -> plugin maker ('eq' expands to several 'eq_band' plugins)
+_EFFECT_MAKERS: Dict[str, Callable[[tuple], Any]] = {
+    'compression': _make_compressor,
+    'reverb': _make_reverb,
+    'delay': _make_delay,
+    'distortion': _make_distortion,
+    'chorus': _make_chorus,
+    'phaser': _make_phaser,
+    'filter': _make_filter,
+    'pitch_shift': _make_pitch_shift,
+    'gain': _make_gain,
+    'eq_band': _make_eq_band,
+}
+
+# Fallback effects, used when Pedalboard is not installed. Each applies one
+# effect in place to a planar float32 buffer with the Numba kernels.
+
+def _fallback_gain(buf: np.ndarray, sample_rate: int, params: Dict[str, Any]) -> None:
+    """Apply gain with the fallback kernels"""
+    fallback_dsp.apply_gain(buf, 10 ** (params.get('gain_db', 0) / 20))
+
+def _fallback_eq(buf: np.ndarray, sample_rate: int, params: Dict[str, Any]) -> None:
+    """Apply EQ with the fallback kernels"""
+    for band, plugin_name, cutoff_hz in _EQ_TABLE:
+        gain_db = params.get(band, 0.0)
+        if abs(gain_db) > _EQ_GAIN_EPSILON_DB:
+            fallback_dsp.biquad(buf, *fallback_dsp.design_biquad(
+                _FALLBACK_EQ_KINDS[plugin_name], cutoff_hz, sample_rate, gain_db, _EQ_Q))
+
+def _fallback_filter(buf: np.ndarray, sample_rate: int, params: Dict[str, Any]) -> None:
+    """Apply a filter with the fallback kernels"""
+    filter_type = params.get('type', 'bandpass')
+    if filter_type == 'lowpass':
+        coeffs = fallback_dsp.design_biquad('lowpass', params.get('cutoff_high', 1000), sample_rate)
+    elif filter_type == 'highpass':
+        coeffs = fallback_dsp.design_biquad('highpass', params.get('cutoff_low', 1000), sample_rate)
+    else:  # bandpass
+        low = params.get('cutoff_low', 500)
+        high = params.get('cutoff_high', 3000)
+        centre = (low + high) / 2
+        coeffs = fallback_dsp.design_biquad('bandpass', centre, sample_rate,
+                                            q=centre / max(high - low, 1))
+    fallback_dsp.biquad(buf, *coeffs)
+
+def _fallback_distortion(buf: np.ndarray, sample_rate: int, params: Dict[str, Any]) -> None:
+    """Apply distortion with the fallback kernels"""
+    fallback_dsp.soft_clip(buf, params.get('drive', 2.0))
+
+def _fallback_delay(buf: np.ndarray, sample_rate: int, params: Dict[str, Any]) -> None:
+    """Apply delay with the fallback kernels"""
+    p = {**_DELAY_DEFAULTS, **params}
+    fallback_dsp.comb_delay(buf, max(1, int(p['time'] * sample_rate)), p['feedback'], p['mix'])
+
+def _fallback_reverb_comb(params: Dict[str, Any], sample_rate: int) -> Tuple[int, float]:
+    """Delay (in samples) and feedback of the comb standing in for a reverb"""
+    p = {**_REVERB_DEFAULTS, **params}
+    delay_samples = max(1, int((0.02 + 0.06 * p['room_size']) * sample_rate))
+    feedback = (0.4 + 0.5 * p['room_size']) * (1.0 - 0.3 * p['damping'])
+    return delay_samples, feedback
+
+def _fallback_reverb(buf: np.ndarray, sample_rate: int, params: Dict[str, Any]) -> None:
+    """Apply reverb with the fallback kernels; a single damped comb stands in for a full reverb"""
+    delay_samples, feedback = _fallback_reverb_comb(params, sample_rate)
+    fallback_dsp.comb_delay(buf, delay_samples, feedback, params.get('wet_level', _REVERB_DEFAULTS['wet_level']))
+
+# Effect type -> fallback effect
+_FALLBACK_EFFECTS: Dict[str, Callable[[np.ndarray, int, Dict[str, Any]], None]] = {
+    'gain': _fallback_gain,
+    'eq': _fallback_eq,
+    'filter': _fallback_filter,
+    'distortion': _fallback_distortion,
+    'delay': _fallback_delay,
+    'reverb': _fallback_reverb,
+}
+
+# Spleeter and the TensorFlow behind it are only located here; separators
+# are created on first use by AdvancedAudioEffects._get_separator, which
+# clears the flag if the import then fails
+SPLEETER_AVAILABLE = (importlib.util.find_spec('spleeter') is not None
+                      and importlib.util.find_spec('tensorflow') is not None)
+if not SPLEETER_AVAILABLE:
+    logger.warning("Spleeter not installed. Source separation will not be available.")
 
 try:
-    # Import Spleeter for source separation
-    import tensorflow as tf
-    from spleeter.separator import Separator
-    SPLEETER_AVAILABLE = True
+    # Import numexpr for single-pass mixing expressions
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
 except ImportError:
-    logger.warning("Spleeter not installed. Source separation will not be available.")
-    SPLEETER_AVAILABLE = False
+    NUMEXPR_AVAILABLE = False
 
 try:
     # Import librosa for advanced audio analysis
@@ -40,30 +359,195 @@ except ImportError:
     logger.warning("Librosa not installed. Some advanced audio effects will not be available.")
     LIBROSA_AVAILABLE = False
 
+# Serializes separator loading, so concurrent first requests load each model once
+_SEPARATOR_LOCK = threading.Lock()
+
+@dataclass
+class _SeparatorWorker:
+    """A Spleeter separator and the single thread that runs all of its inference"""
+    separator: "Separator"
+    executor: ThreadPoolExecutor
+    
+    def separate(self, waveform: np.ndarray) -> Dict[str, np.ndarray]:
+        """Separate a (samples, channels) waveform on the worker thread"""
+        return self.executor.submit(self.separator.separate, waveform).result()
+
+def _build_separator_worker(mode: str, policy: Optional[str] = None) -> _SeparatorWorker:
+    """
+    Create a Spleeter worker and build its TF graph with a silent warm-up run
+    
+    Args:
+        mode: Separation mode ('2stems', '4stems', or '5stems')
+        policy: Keras dtype policy to build the graph under; the previous global
+            policy is restored afterwards, so other models are unaffected
+        
+    Returns:
+        Warmed-up worker
+    """
+    from spleeter.separator import Separator
+    
+    previous_policy = None
+    if policy is not None:
+        import tensorflow as tf
+        previous_policy = tf.keras.mixed_precision.global_policy()
+        tf.keras.mixed_precision.set_global_policy(policy)
+    
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'spleeter-{mode}')
+    try:
+        worker = _SeparatorWorker(Separator(f'spleeter:{mode}'), executor)
+        # Build the TF graph and session now rather than on the first real
+        # request; the dtype policy only has to be in effect while it is built
+        worker.separate(np.zeros((_SEPARATOR_WARMUP_SAMPLES, 2), dtype=_DTYPE))
+    except Exception:
+        executor.shutdown(wait=False)
+        raise
+    finally:
+        if previous_policy is not None:
+            tf.keras.mixed_precision.set_global_policy(previous_policy)
+    return worker
+
+def _peak_normalize(audio_data: np.ndarray, ceiling: float = 0.99) -> np.ndarray:
+    """Scale audio in place so its peak does not exceed ceiling"""
+    peak = max(audio_data.max(), -audio_data.min()) if audio_data.size else 0.0
+    if peak > ceiling:
+        np.multiply(audio_data, ceiling / peak, out=audio_data)
+    return audio_data
+
+class CompiledChain:
+    """A Pedalboard assembled and primed once for a fixed chain, sample rate and channel count"""
+    
+    __slots__ = ('board', 'sample_rate', 'channels', 'block_size', 'scratch')
+    
+    # Frames pushed through the board once at compile time to prime the plugins
+    _WARMUP_FRAMES = 64
+    
+    def __init__(self, board: "Pedalboard", sample_rate: int, channels: int,
+                 block_size: int = _DEFAULT_BLOCK_SIZE):
+        """
+        Initialize the compiled chain
+        
+        Args:
+            board: Pedalboard holding the chain's plugins (owned by this chain)
+            sample_rate: Sample rate in Hz
+            channels: Number of channels the chain will be fed
+            block_size: Frames per block passed to Pedalboard
+        """
+        self.board = board
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_size = block_size
+        # Staging buffer for input that is not already contiguous float32; grown on demand
+        self.scratch = np.zeros(channels * block_size, dtype=_DTYPE)
+        
+        # Run the plugins once so their internal buffers are allocated up front
+        board.process(self.scratch[:channels * self._WARMUP_FRAMES].reshape(channels, -1),
+                      sample_rate, buffer_size=block_size)
+    
+    def process(self, audio_data: np.ndarray, reset: bool = True) -> np.ndarray:
+        """
+        Process planar audio through the compiled chain
+        
+        Args:
+            audio_data: Audio samples shaped (channels, samples)
+            reset: Clear plugin state first; pass False when feeding consecutive
+                blocks of one stream
+            
+        Returns:
+            Processed planar float32 audio
+        """
+        if audio_data.shape[0] != self.channels:
+            raise ValueError(f"Expected {self.channels} channels, got {audio_data.shape[0]}")
+        
+        if audio_data.dtype != _DTYPE or not audio_data.flags.c_contiguous:
+            size = audio_data.size
+            if self.scratch.size < size:
+                self.scratch = np.empty(size, dtype=_DTYPE)
+            staged = self.scratch[:size].reshape(audio_data.shape)
+            np.copyto(staged, audio_data, casting='unsafe')
+            audio_data = staged
+        
+        return self.board.process(audio_data, self.sample_rate,
+                                  buffer_size=self.block_size, reset=reset)
+
 class AdvancedAudioEffects:
     """Advanced audio effects processor using Pedalboard"""
     
-    def __init__(self):
+    # Instances are created per worker thread (see get_advanced_effects)
+    __slots__ = (
+        'pedalboard_available', 'spleeter_available', 'librosa_available',
+        'fallback_dsp_available', 'reuse_effects', '_makers', '_board_cache',
+    )
+    
+    def __init__(self, reuse_effects: bool = True):
+        """
+        Initialize the effects processor
+        
+        Args:
+            reuse_effects: Share plugin instances between boards built from
+                identical parameters instead of constructing them in the C++
+                layer each time. Shared plugins keep their internal state
+                between boards; pass False to give every board fresh plugins.
+        """
         self.pedalboard_available = PEDALBOARD_AVAILABLE
         self.spleeter_available = SPLEETER_AVAILABLE
         self.librosa_available = LIBROSA_AVAILABLE
+        self.fallback_dsp_available = fallback_dsp.NUMBA_AVAILABLE
+        self.reuse_effects = reuse_effects
         
-        # Initialize Spleeter if available
-        if self.spleeter_available:
+        # Plugin makers, memoized per instance so plugins never cross threads
+        self._makers: Dict[str, Callable[[tuple], Any]] = {
+            name: lru_cache(maxsize=_CACHE_MAX_ENTRIES)(maker) if reuse_effects else maker
+            for name, maker in _EFFECT_MAKERS.items()
+        }
+        # Reuse assembled boards across calls with an identical chain; kept in
+        # least-recently-used order for eviction
+        self._board_cache: Dict[tuple, Any] = {}
+    
+    def _get_separator(self, mode: str) -> _SeparatorWorker:
+        """
+        Get the Spleeter worker for a mode, loading and warming its model on first use
+        
+        Args:
+            mode: Separation mode ('2stems', '4stems', or '5stems')
+            
+        Returns:
+            Worker wrapping the mode's Separator and its inference thread
+        """
+        global SPLEETER_AVAILABLE
+        with _SEPARATOR_LOCK:
             try:
-                # Initialize with 2 stems (vocals and accompaniment)
-                self.separator_2stems = Separator('spleeter:2stems')
-                # Initialize with 4 stems (vocals, drums, bass, other)
-                self.separator_4stems = Separator('spleeter:4stems')
-                # Initialize with 5 stems (vocals, drums, bass, piano, other)
-                self.separator_5stems = Separator('spleeter:5stems')
-                logger.info("Spleeter initialized successfully")
-            except Exception as e:
-                logger.error(f"Error initializing Spleeter: {str(e)}")
-                self.spleeter_available = False
+                return self._load_separator(mode)
+            except ImportError as e:
+                # Spleeter or TensorFlow is installed but cannot be loaded
+                SPLEETER_AVAILABLE = self.spleeter_available = False
+                logger.warning("Spleeter could not be imported (%s). Source separation will not be available.", e)
+                raise
+    
+    @staticmethod
+    @lru_cache(maxsize=3)
+    def _load_separator(mode: str) -> _SeparatorWorker:
+        """Load and warm the Spleeter model for a mode; callers hold _SEPARATOR_LOCK"""
+        if os.environ.get("SPLEETER_FP16") == "1":
+            # Half-precision inference on GPUs with tensor cores; the weights
+            # stay float32 and are cast per layer by Keras' mixed precision
+            import tensorflow as tf
+            if tf.config.list_physical_devices('GPU'):
+                try:
+                    worker = _build_separator_worker(mode, 'mixed_float16')
+                    logger.info("Spleeter %s separator initialized with the mixed_float16 policy", mode)
+                    return worker
+                except Exception as e:
+                    logger.warning("Spleeter %s failed under mixed_float16 (%s), loading it in float32", mode, e)
+        
+        worker = _build_separator_worker(mode)
+        logger.info("Spleeter %s separator initialized", mode)
+        return worker
     
     def process_with_pedalboard(self, audio_data: np.ndarray, sample_rate: int, 
-                               effects_chain: list) -> np.ndarray:
+                               effects_chain: list,
+                               layout: str = 'samples_channels',
+                               block_size: int = _DEFAULT_BLOCK_SIZE,
+                               out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Process audio with a chain of Pedalboard effects
         
@@ -71,74 +555,506 @@ class AdvancedAudioEffects:
             audio_data: Audio samples as numpy array
             sample_rate: Sample rate in Hz
             effects_chain: List of effect configurations
+            layout: Layout of multi-channel audio, 'samples_channels' (librosa
+                style, transposed on the way in and out) or 'channels_samples'
+                (planar, passed to Pedalboard as-is and returned planar)
+            block_size: Frames per block pushed through the whole chain before
+                moving on, so the working set stays cache-resident
+            out: Optional preallocated array to write the result into; it must
+                have the shape of the returned audio, i.e. (channels, samples)
+                for 'channels_samples' and (samples, channels) otherwise
+                
+        float16 input is processed in float32 and returned as float16.
             
         Returns:
             Processed audio as numpy array
         """
-        if not self.pedalboard_available:
+        if layout not in _LAYOUTS:
+            raise ValueError(f"Unsupported layout: {layout}")
+        
+        if not self.pedalboard_available and not self.fallback_dsp_available:
             logger.warning("Pedalboard not available. Returning original audio.")
             return audio_data
             
-        try:
-            # Create a new pedalboard
-            board = Pedalboard()
+        # Ensure audio is float32 in the shape Pedalboard expects,
+        # (channels, samples). The cast and the layout change are done in a
+        # single copy, and skipped entirely for contiguous float32 input.
+        if len(audio_data.shape) == 1:  # Mono
+            audio_data_pb = np.ascontiguousarray(audio_data, dtype=_DTYPE)[np.newaxis, :]
+        elif layout == 'channels_samples':  # Already planar
+            audio_data_pb = np.ascontiguousarray(audio_data, dtype=_DTYPE)
+        else:  # (samples, channels)
+            audio_data_pb = np.ascontiguousarray(audio_data.T, dtype=_DTYPE)
             
-            # Add effects to the pedalboard
-            for effect in effects_chain:
-                effect_type = effect.get('type')
-                params = effect.get('parameters', {})
-                
-                if effect_type == 'eq':
-                    # EQ is handled as a combination of filters in Pedalboard
-                    self._add_eq_to_board(board, params)
-                elif effect_type == 'compression':
-                    board.append(self._create_compressor(params))
-                elif effect_type == 'reverb':
-                    board.append(self._create_reverb(params))
-                elif effect_type == 'delay':
-                    board.append(self._create_delay(params))
-                elif effect_type == 'distortion':
-                    board.append(self._create_distortion(params))
-                elif effect_type == 'chorus':
-                    board.append(self._create_chorus(params))
-                elif effect_type == 'phaser':
-                    board.append(self._create_phaser(params))
-                elif effect_type == 'filter':
-                    board.append(self._create_filter(params))
-                elif effect_type == 'pitch_shift':
-                    board.append(self._create_pitch_shift(params))
-                elif effect_type == 'gain':
-                    board.append(Gain(gain_db=params.get('gain_db', 0)))
-            
-            # Process the audio
-            # Convert to float32 if needed (Pedalboard expects float32)
-            if audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
-                
-            # Ensure audio is in the right shape for Pedalboard
-            # Pedalboard expects shape (channels, samples) but librosa uses (samples, channels)
-            if len(audio_data.shape) == 1:  # Mono
-                audio_data_pb = audio_data.reshape(1, -1)
-            else:  # Stereo or multi-channel
-                audio_data_pb = audio_data.T
-                
-            # Process the audio
-            processed_audio = board.process(audio_data_pb, sample_rate)
-            
-            # Convert back to librosa's format
-            if len(processed_audio.shape) == 2:  # Multi-channel
-                processed_audio = processed_audio.T
-            else:  # Mono
-                processed_audio = processed_audio.reshape(-1)
-                
-            return processed_audio
+        # The fallback kernels work in place, so never touch the caller's buffer
+        if not self.pedalboard_available and np.may_share_memory(audio_data_pb, audio_data):
+            audio_data_pb = audio_data_pb.copy()
+        processed_audio = self.process_planar(audio_data_pb, sample_rate, effects_chain, block_size)
+        
+        # Mono input gets mono output back (a view of the single row);
+        # otherwise planar callers get planar output, others librosa's format
+        if len(audio_data.shape) == 1:
+            processed_audio = processed_audio[0]
+        elif layout != 'channels_samples':
+            processed_audio = processed_audio.T
+        
+        # Half-precision callers keep half-precision storage; only the
+        # processing itself runs in float32
+        if audio_data.dtype == np.float16 and out is None:
+            processed_audio = processed_audio.astype(np.float16)
+        
+        # Write into the caller's scratch buffer instead of handing back a new one
+        if out is not None:
+            np.copyto(out, processed_audio)
+            return out
             
-        except Exception as e:
-            logger.error(f"Error processing with Pedalboard: {str(e)}")
-            return audio_data
+        return processed_audio
+    
+    def process_planar(self, audio_data_pb: np.ndarray, sample_rate: int, effects_chain: list,
+                       block_size: int = _DEFAULT_BLOCK_SIZE) -> np.ndarray:
+        """
+        Process audio in the module's canonical layout
+        
+        Args:
+            audio_data_pb: C-contiguous float32 audio shaped (channels, samples);
+                the fallback kernels process it in place
+            sample_rate: Sample rate in Hz
+            effects_chain: List of effect configurations
+            block_size: Frames per block pushed through the whole chain before
+                moving on, so the working set stays cache-resident
+            
+        Returns:
+            Processed audio in the same layout (the input itself if Pedalboard fails)
+        """
+        if self.pedalboard_available:
+            # Only the calls into Pedalboard's C++ layer are guarded; anything
+            # else is a bug and should surface
+            try:
+                # Reuse the assembled board when the same chain is requested again
+                chain_key = self._chain_key(effects_chain)
+                board = self._cached_board(chain_key)
+            
+                if board is None:
+                    board = self._build_board(effects_chain)
+                    self._store_board(chain_key, board)
+            
+                channels, samples = audio_data_pb.shape
+                if (channels > 1 and samples >= _PARALLEL_MIN_SECONDS * sample_rate
+                        and all(self._is_channel_independent(effect.get('type'))
+                                for effect in effects_chain)):
+                    # Long multi-channel buffer through per-channel effects only:
+                    # run each channel on its own board in parallel (Pedalboard
+                    # releases the GIL while processing)
+                    boards = [board] + [self._channel_board(effects_chain, chain_key, channel)
+                                        for channel in range(1, channels)]
+                    with ThreadPoolExecutor(max_workers=channels) as executor:
+                        outputs = list(executor.map(
+                            lambda channel: boards[channel].process(
+                                audio_data_pb[channel:channel + 1], sample_rate, buffer_size=block_size),
+                            range(channels)))
+                    processed_audio = np.concatenate(outputs, axis=0)
+                else:
+                    # Process the audio. Pedalboard runs every plugin on one block of
+                    # block_size frames before moving to the next block.
+                    processed_audio = board.process(audio_data_pb, sample_rate, buffer_size=block_size)
+            except (RuntimeError, ValueError, TypeError) as e:
+                logger.error("Error processing with Pedalboard: %s", e)
+                return audio_data_pb
+            except ImportError:
+                # Pedalboard is present but broken; switch this instance over
+                self.pedalboard_available = False
+                if not self.fallback_dsp_available:
+                    return audio_data_pb
+                # The input may still be the caller's buffer, and the kernels work in place
+                processed_audio = self._process_fallback(audio_data_pb.copy(), sample_rate, effects_chain)
+        else:
+            processed_audio = self._process_fallback(audio_data_pb, sample_rate, effects_chain)
+        
+        return processed_audio
+        
+    
+    def process_stream(self, in_path: str, out_path: str, effects_chain: list,
+                       block_sec: float = _STREAM_BLOCK_SECONDS) -> str:
+        """
+        Process an audio file block by block, so memory use does not grow with its length
+        
+        With Pedalboard, one board carries its state across the blocks and the
+        result matches processing the whole file. Chains with latency (pitch
+        shift) and the fallback kernels process blocks independently with
+        overlapping context instead; blocks then grow to cover the effect tails.
+        
+        Args:
+            in_path: Path of the audio file to read
+            out_path: Path of the audio file to write (format from its extension)
+            effects_chain: List of effect configurations
+            block_sec: Length of each block in seconds
+            
+        Returns:
+            Path of the written file
+        """
+        with sf.SoundFile(in_path) as infile, \
+                sf.SoundFile(out_path, 'w', samplerate=infile.samplerate,
+                             channels=infile.channels) as outfile:
+            sample_rate = infile.samplerate
+            blocksize = int(block_sec * sample_rate)
+            blocks = (block.T for block in infile.blocks(blocksize=blocksize, always_2d=True, dtype=_DTYPE))
+            
+            if self._streams_statefully(effects_chain):
+                # One board runs across all blocks without resetting, so reverb
+                # tails, delay lines and compressor envelopes carry over exactly
+                chain = self.compile(effects_chain, sample_rate, infile.channels)
+                chain.board.reset()
+                for block in blocks:
+                    outfile.write(chain.process(block, reset=False).T)
+            else:
+                for processed in self._stream_blocks(blocks, sample_rate, effects_chain, blocksize):
+                    outfile.write(processed.T)
+        
+        return out_path
+    
+    def stream_pedalboard(self, chunks_iter: Iterable[np.ndarray], sample_rate: int,
+                          effects_chain: list,
+                          chunk_samples: int = _STREAM_CHUNK_SAMPLES) -> Iterator[np.ndarray]:
+        """
+        Process a stream of audio chunks, carrying effect state from one chunk to the next
+        
+        Args:
+            chunks_iter: Planar float32 chunks shaped (channels, samples)
+            sample_rate: Sample rate in Hz
+            effects_chain: List of effect configurations
+            chunk_samples: Frames per block passed to Pedalboard
+            
+        Yields:
+            Processed planar chunks, one per input chunk. Chains with latency
+            (pitch shift), and all chains when only the fallback kernels are
+            available, are processed in overlapping blocks of at least the
+            effect tail length instead: their output comes in larger pieces
+            and lags the input by up to one block, but adds up to the same
+            number of frames.
+        """
+        if not self._streams_statefully(effects_chain):
+            yield from self._stream_blocks(chunks_iter, sample_rate, effects_chain, chunk_samples)
+            return
+        
+        chain = None
+        for chunk in chunks_iter:
+            if chain is None:
+                # Built once, on the first chunk, when the channel count is known
+                chain = self.compile(effects_chain, sample_rate, chunk.shape[0], block_size=chunk_samples)
+                chain.board.reset()
+            yield chain.process(chunk, reset=False)
+    
+    def stream_file(self, path: str, effects_chain: list,
+                    chunk_samples: int = _STREAM_CHUNK_SAMPLES) -> Iterator[np.ndarray]:
+        """
+        Decode an audio file chunk by chunk with Pedalboard and process it as a stream
+        
+        Args:
+            path: Path of the audio file to read
+            effects_chain: List of effect configurations
+            chunk_samples: Frames decoded and processed per chunk
+            
+        Yields:
+            Processed planar float32 chunks shaped (channels, samples)
+        """
+        from pedalboard.io import AudioFile
+        
+        with AudioFile(path) as f:
+            def chunks():
+                while f.tell() < f.frames:
+                    yield f.read(chunk_samples)
+            
+            yield from self.stream_pedalboard(chunks(), f.samplerate, effects_chain, chunk_samples)
+    
+    def _streams_statefully(self, effects_chain: list) -> bool:
+        """Whether a stream through the chain can run on one board that keeps its state between calls"""
+        return self.pedalboard_available and not any(
+            effect.get('type') in _LATENCY_EFFECTS for effect in effects_chain)
+    
+    def _stream_context(self, effects_chain: list, sample_rate: int) -> int:
+        """
+        Frames of preceding input a block needs so that, processed from a clean
+        state, it continues where the previous block left off
+        
+        Args:
+            effects_chain: List of effect configurations
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            Context length in frames
+        """
+        context = _STREAM_OVERLAP + _STREAM_CROSSFADE
+        for effect in effects_chain:
+            effect_type = effect.get('type')
+            params = effect.get('parameters') or _EMPTY
+            
+            if effect_type == 'pitch_shift':
+                context += int(_PITCH_SHIFT_CONTEXT_SECONDS * sample_rate)
+                continue
+            if effect_type == 'compression':
+                # The envelope follower forgets within a few release times
+                release_ms = params.get('release', _COMPRESSOR_DEFAULTS['release'])
+                context += int(5 * release_ms / 1000 * sample_rate)
+                continue
+            if effect_type == 'delay':
+                p = {**_DELAY_DEFAULTS, **params}
+                period, feedback = p['time'] * sample_rate, p['feedback']
+            elif effect_type == 'reverb' and self.pedalboard_available:
+                p = {**_REVERB_DEFAULTS, **params}
+                period = _FREEVERB_MAX_COMB * sample_rate / 44100
+                feedback = 1.0 if p['freeze_mode'] >= 0.5 else (
+                    _FREEVERB_FEEDBACK_OFFSET + _FREEVERB_FEEDBACK_SCALE * p['room_size'])
+            elif effect_type == 'reverb':
+                period, feedback = _fallback_reverb_comb(params, sample_rate)
+            else:
+                continue
+            
+            # Echoes of a feedback loop until it has decayed below the tail level
+            feedback = abs(feedback)
+            if feedback >= 1.0:
+                return int(_STREAM_MAX_CONTEXT_SECONDS * sample_rate)
+            echoes = math.ceil(math.log(_STREAM_TAIL_LEVEL) / math.log(feedback)) if feedback > 0 else 1
+            context += int(period * echoes)
+        
+        return min(context, int(_STREAM_MAX_CONTEXT_SECONDS * sample_rate))
+    
+    def _stream_blocks(self, chunks_iter: Iterable[np.ndarray], sample_rate: int,
+                       effects_chain: list, block_samples: int) -> Iterator[np.ndarray]:
+        """
+        Process a stream of planar chunks as independent, overlapping blocks
+        
+        Used where effect state cannot be carried from one call to the next:
+        by the fallback kernels, and by Pedalboard chains with latency. Each
+        block is processed from a clean state together with enough of the
+        preceding input to rebuild the effect tails (see _stream_context);
+        that context is dropped again and consecutive blocks are crossfaded.
+        
+        Args:
+            chunks_iter: Planar float32 chunks shaped (channels, samples)
+            sample_rate: Sample rate in Hz
+            effects_chain: List of effect configurations
+            block_samples: Frames per block; raised to the context length if shorter
+            
+        Yields:
+            Processed planar float32 audio, as many frames in total as were read.
+            Output lags the input by up to one block.
+        """
+        context_samples = self._stream_context(effects_chain, sample_rate)
+        block_samples = max(block_samples, context_samples)
+        
+        # Input not processed yet, preceded by `start` frames of context
+        buffered = None
+        start = 0
+        # Last output frames, held back to be crossfaded into the next block
+        held = None
+        
+        def process(block: np.ndarray) -> np.ndarray:
+            nonlocal held
+            # A fresh contiguous copy: the fallback kernels work in place
+            processed = self.process_planar(np.array(block, dtype=_DTYPE, order='C'),
+                                            sample_rate, effects_chain)
+            overlap = min(held.shape[1], start) if held is not None else 0
+            out = processed[:, start - overlap:]
+            if overlap:
+                ramp = np.linspace(0.0, 1.0, overlap, dtype=_DTYPE)
+                out[:, :overlap] = held[:, held.shape[1] - overlap:] * (1 - ramp) + out[:, :overlap] * ramp
+            if held is not None and overlap < held.shape[1]:
+                # Held frames the new block has no context for are passed on as they are
+                out = np.concatenate((held[:, :held.shape[1] - overlap], out), axis=1)
+            held = out[:, max(0, out.shape[1] - _STREAM_CROSSFADE):]
+            return out[:, :out.shape[1] - held.shape[1]]
+        
+        for chunk in chunks_iter:
+            buffered = chunk if buffered is None else np.concatenate((buffered, chunk), axis=1)
+            while buffered.shape[1] - start >= block_samples:
+                end = start + block_samples
+                out = process(buffered[:, :end])
+                if out.shape[1]:
+                    yield out
+                # Keep the end of this block's input as the next block's context
+                keep_from = max(0, end - context_samples)
+                buffered = buffered[:, keep_from:]
+                start = end - keep_from
+        
+        if buffered is not None and buffered.shape[1] > start:
+            out = process(buffered)
+            if out.shape[1]:
+                yield out
+        if held is not None and held.shape[1]:
+            yield held
+    
+    def compile(self, effects_chain: list, sample_rate: int, channels: int,
+                block_size: int = _DEFAULT_BLOCK_SIZE) -> CompiledChain:
+        """
+        Build a reusable, pre-primed processor for a static effects chain
+        
+        Args:
+            effects_chain: List of effect configurations
+            sample_rate: Sample rate in Hz
+            channels: Number of channels that will be processed
+            block_size: Frames per block passed to Pedalboard
+            
+        Returns:
+            CompiledChain whose process() only does per-sample work
+        """
+        if not self.pedalboard_available:
+            raise RuntimeError("Pedalboard not available, effects chains cannot be compiled")
+        
+        # The compiled chain keeps plugin state between calls, so it gets
+        # its own plugin instances rather than the shared cached ones
+        board = self._build_board(effects_chain, use_effect_cache=False)
+        return CompiledChain(board, sample_rate, channels, block_size)
+    
+    def compile_runner(self, effects_chain: list) -> Callable[[np.ndarray, int], np.ndarray]:
+        """
+        Generate a specialized processing function for a fixed effects chain
+        
+        Args:
+            effects_chain: List of effect configurations
+            
+        Returns:
+            Function taking (audio_data, sample_rate) with mono or planar
+            (channels, samples) float32 audio and returning processed audio of
+            the same shape
+        """
+        if not self.pedalboard_available:
+            raise RuntimeError("Pedalboard not available, effects chains cannot be compiled")
+        
+        namespace = {'board': self._build_board(effects_chain, use_effect_cache=False), 'np': np}
+        exec(_RUNNER_SOURCE, namespace)
+        return namespace['run']
+    
+    def _process_fallback(self, audio_pb: np.ndarray, sample_rate: int,
+                          effects_chain: list) -> np.ndarray:
+        """Process planar float32 audio in place with the Numba fallback kernels"""
+        get_kernel = _FALLBACK_EFFECTS.get
+        for effect in effects_chain:
+            effect_type = effect.get('type')
+            kernel = get_kernel(effect_type)
+            if kernel is not None:
+                kernel(audio_pb, sample_rate, effect.get('parameters') or _EMPTY)
+            elif logger.isEnabledFor(logging.DEBUG):
+                logger.debug("No fallback kernel for effect '%s', skipping", effect_type)
+        
+        return audio_pb
+    
+    @classmethod
+    def _is_channel_independent(cls, effect_type: str) -> bool:
+        """Whether an effect processes each channel without looking at the others"""
+        return effect_type in _CHANNEL_INDEPENDENT_EFFECTS
+    
+    def _cached_board(self, key: Optional[tuple]) -> Optional["Pedalboard"]:
+        """Look up a cached board, marking it as most recently used"""
+        if key is None:
+            return None
+        board = self._board_cache.pop(key, None)
+        if board is not None:
+            # Re-inserted so the dict's insertion order stays least-recently-used first
+            self._board_cache[key] = board
+        return board
+    
+    def _store_board(self, chain_key: Optional[tuple], board: "Pedalboard") -> None:
+        """Cache an assembled board (no-op for uncacheable chains)"""
+        if chain_key is None:
+            return
+        if len(self._board_cache) >= _CACHE_MAX_ENTRIES:
+            # Evict only the least recently used board, so the chains a
+            # streaming pipeline keeps reusing are never rebuilt
+            del self._board_cache[next(iter(self._board_cache))]
+        self._board_cache[chain_key] = board
+    
+    def _channel_board(self, effects_chain: list, chain_key: Optional[tuple],
+                       channel: int) -> "Pedalboard":
+        """Get a board with its own plugin instances for processing one extra channel"""
+        key = (chain_key, channel) if chain_key is not None else None
+        board = self._cached_board(key)
+        if board is None:
+            # Plugins hold per-stream state, so channels processed concurrently
+            # must not share instances with the cached board
+            board = self._build_board(effects_chain, use_effect_cache=False)
+            self._store_board(key, board)
+        return board
+    
+    def _build_board(self, effects_chain: list, use_effect_cache: bool = True) -> "Pedalboard":
+        """Assemble a Pedalboard for the given effects chain"""
+        reuse = use_effect_cache and self.reuse_effects
+        plugins = []
+        # Ids of the plugins already placed in this board; Pedalboard rejects
+        # a chain holding the same instance twice
+        in_use = set()
+        # Bound once, outside the loop
+        append = plugins.append
+        make_effect = self._make_effect
+        
+        # Collect the plugins first and hand them to Pedalboard in one call
+        for effect in effects_chain:
+            effect_type = effect.get('type')
+            params = effect.get('parameters') or _EMPTY
+            
+            if effect_type == 'eq':
+                # EQ is handled as a combination of filters in Pedalboard
+                plugins.extend(self._build_eq_plugins(params, reuse, in_use))
+            elif effect_type in _EFFECT_MAKERS:
+                append(make_effect(effect_type, params, reuse, in_use))
+        
+        return _cls('Pedalboard')(plugins)
+    
+    @staticmethod
+    def _params_key(params: Dict[str, Any]) -> Optional[tuple]:
+        """Build a hashable cache key from effect parameters (None if unhashable)"""
+        try:
+            key = tuple(sorted(params.items()))
+            hash(key)
+            return key
+        except TypeError:
+            return None
+    
+    def _chain_key(self, effects_chain: list) -> Optional[tuple]:
+        """Build a hashable cache key for a whole effects chain"""
+        key = []
+        for effect in effects_chain:
+            params_key = self._params_key(effect.get('parameters') or _EMPTY)
+            if params_key is None:
+                return None
+            key.append((effect.get('type'), params_key))
+        return tuple(key)
+    
+    def _make_effect(self, name: str, params: Dict[str, Any], reuse: bool = True,
+                     in_use: Optional[set] = None) -> Any:
+        """
+        Create the plugin for (name, params), reusing a memoized instance when allowed
+        
+        Args:
+            name: Effect type (a key of _EFFECT_MAKERS)
+            params: Effect parameters
+            reuse: Return the memoized instance for these parameters if there is one
+            in_use: Ids of plugins already in the board being built; a memoized
+                instance found here is replaced by a fresh one, and the id of the
+                returned plugin is added
+            
+        Returns:
+            Pedalboard plugin
+        """
+        maker = self._makers[name]
+        key = self._params_key(params)
+        if key is None:  # Unhashable parameters can't be memoized
+            key = tuple(params.items())
+            reuse = False
+        if not reuse:
+            maker = getattr(maker, '__wrapped__', maker)
+        plugin = maker(key)
+        
+        if in_use is not None:
+            if id(plugin) in in_use:
+                # The same effect repeated within one chain needs its own instance
+                plugin = getattr(maker, '__wrapped__', maker)(key)
+            in_use.add(id(plugin))
+        return plugin
     
     def separate_sources(self, audio_data: np.ndarray, sample_rate: int, 
-                        mode: str = '2stems') -> Dict[str, np.ndarray]:
+                        mode: str = '2stems',
+                        chunk_sec: Optional[float] = _SEPARATION_CHUNK_SECONDS,
+                        lookahead_sec: float = _SEPARATION_LOOKAHEAD_SECONDS) -> Dict[str, np.ndarray]:
         """
         Separate audio into different sources (vocals, accompaniment, etc.)
         
@@ -146,6 +1062,10 @@ class AdvancedAudioEffects:
             audio_data: Audio samples as numpy array
             sample_rate: Sample rate in Hz
             mode: Separation mode ('2stems', '4stems', or '5stems')
+            chunk_sec: Length of the chunks fed to Spleeter in seconds, or None
+                to separate the whole signal in one pass
+            lookahead_sec: Context added on each side of a chunk and discarded
+                afterwards; longer context trades speed for fewer seam artifacts
             
         Returns:
             Dictionary of separated sources
@@ -155,52 +1075,127 @@ class AdvancedAudioEffects:
             return {"original": audio_data}
             
         try:
-            # Ensure audio is in the right format for Spleeter
-            # Spleeter expects shape (samples, channels)
-            if len(audio_data.shape) == 1:  # Mono
-                audio_data_spleeter = np.stack([audio_data, audio_data], axis=1)
-            else:  # Stereo or multi-channel
-                if audio_data.shape[1] == 2:  # Already in (samples, channels) format
-                    audio_data_spleeter = audio_data
-                else:  # Convert from (channels, samples) to (samples, channels)
-                    audio_data_spleeter = audio_data.T
-                    
-                # Ensure we have 2 channels (stereo)
-                if audio_data_spleeter.shape[1] == 1:  # Mono
-                    audio_data_spleeter = np.tile(audio_data_spleeter, (1, 2))
-                elif audio_data_spleeter.shape[1] > 2:  # More than 2 channels
-                    audio_data_spleeter = audio_data_spleeter[:, :2]
-            
-            # Choose the appropriate separator based on mode
-            if mode == '4stems':
-                separator = self.separator_4stems
-            elif mode == '5stems':
-                separator = self.separator_5stems
-            else:  # Default to 2stems
-                separator = self.separator_2stems
+            audio_data_spleeter = self._spleeter_input(audio_data)
+            worker = self._get_separator(self._separation_mode(mode))
             
-            # Separate sources
-            waveform = audio_data_spleeter.T  # Spleeter expects (channels, samples)
-            prediction = separator.separate(waveform)
-            
-            # Convert back to librosa's format (samples,) or (samples, channels)
-            result = {}
-            for source_name, source_data in prediction.items():
-                # Convert from (channels, samples) to (samples, channels)
-                source_data = source_data.T
-                
-                # If original was mono, convert back to mono
-                if len(audio_data.shape) == 1:
-                    source_data = np.mean(source_data, axis=1)
-                
-                result[source_name] = source_data
+            # Separate sources. Spleeter takes and returns (samples, channels),
+            # the same layout as librosa, so no transposes are needed.
+            if chunk_sec is None or len(audio_data_spleeter) <= chunk_sec * sample_rate:
+                prediction = worker.separate(audio_data_spleeter)
+            else:
+                prediction = self._separate_chunked(worker, audio_data_spleeter,
+                                                    int(chunk_sec * sample_rate),
+                                                    int(lookahead_sec * sample_rate))
             
-            return result
+            return self._spleeter_output(prediction, audio_data)
             
         except Exception as e:
             logger.error(f"Error separating sources: {str(e)}")
             return {"original": audio_data}
     
+    def separate_many(self, audio_list: List[np.ndarray], sample_rate: int,
+                      mode: str = '2stems') -> List[Dict[str, np.ndarray]]:
+        """
+        Separate several signals, queueing them all on the mode's inference thread
+        
+        Input preparation for later signals overlaps with inference of earlier
+        ones. Each signal is separated in a single pass (no chunking).
+        
+        Args:
+            audio_list: Audio samples for each signal
+            sample_rate: Sample rate in Hz
+            mode: Separation mode ('2stems', '4stems', or '5stems')
+            
+        Returns:
+            Dictionary of separated sources for each signal, in input order
+        """
+        if not self.spleeter_available:
+            logger.warning("Spleeter not available. Returning original audio.")
+            return [{"original": audio_data} for audio_data in audio_list]
+        
+        try:
+            worker = self._get_separator(self._separation_mode(mode))
+        except ImportError:
+            return [{"original": audio_data} for audio_data in audio_list]
+        futures = [worker.executor.submit(worker.separator.separate, self._spleeter_input(audio_data))
+                   for audio_data in audio_list]
+        
+        results = []
+        for audio_data, future in zip(audio_list, futures):
+            try:
+                results.append(self._spleeter_output(future.result(), audio_data))
+            except Exception as e:
+                logger.error("Error separating sources: %s", e)
+                results.append({"original": audio_data})
+        return results
+    
+    @staticmethod
+    def _separation_mode(mode: str) -> str:
+        """Normalize a separation mode, defaulting to 2stems"""
+        return mode if mode in ('4stems', '5stems') else '2stems'
+    
+    @staticmethod
+    def _spleeter_input(audio_data: np.ndarray) -> np.ndarray:
+        """Convert audio to the stereo (samples, channels) layout Spleeter expects"""
+        # Mono is duplicated to stereo as a zero-copy broadcast view
+        if len(audio_data.shape) == 1:  # Mono
+            return np.broadcast_to(audio_data[:, None], (audio_data.shape[0], 2))
+        
+        if audio_data.shape[1] == 2:  # Already in (samples, channels) format
+            audio_data_spleeter = audio_data
+        else:  # Convert from (channels, samples) to (samples, channels)
+            audio_data_spleeter = audio_data.T
+            
+        # Ensure we have 2 channels (stereo)
+        if audio_data_spleeter.shape[1] == 1:  # Mono
+            audio_data_spleeter = np.broadcast_to(audio_data_spleeter, (audio_data_spleeter.shape[0], 2))
+        elif audio_data_spleeter.shape[1] > 2:  # More than 2 channels
+            audio_data_spleeter = audio_data_spleeter[:, :2]
+        return audio_data_spleeter
+    
+    @staticmethod
+    def _spleeter_output(prediction: Dict[str, np.ndarray],
+                         audio_data: np.ndarray) -> Dict[str, np.ndarray]:
+        """Convert Spleeter's output back to librosa's format (samples,) or (samples, channels)"""
+        # Stereo sources are already (samples, channels)
+        if len(audio_data.shape) > 1 or not prediction:
+            return dict(prediction)
+        
+        # If original was mono, convert back to mono: every source is downmixed
+        # into its row of one (sources, samples) allocation, and the results
+        # are contiguous row views of it
+        names = list(prediction)
+        first = prediction[names[0]]
+        mono = np.empty((len(names), first.shape[0]), dtype=first.dtype)
+        for row, source_name in enumerate(names):
+            np.mean(prediction[source_name], axis=1, out=mono[row])
+        
+        return {source_name: mono[row] for row, source_name in enumerate(names)}
+    
+    def _separate_chunked(self, worker: _SeparatorWorker, waveform: np.ndarray,
+                          chunk_samples: int, lookahead_samples: int) -> Dict[str, np.ndarray]:
+        """
+        Run a separator worker over consecutive chunks of a (samples, channels) waveform
+        
+        Each chunk is separated together with lookahead_samples of context on
+        either side; only the chunk itself is kept, so Spleeter's working set
+        is bounded by the chunk length rather than the whole signal.
+        """
+        total = len(waveform)
+        result: Dict[str, np.ndarray] = {}
+        for start in range(0, total, chunk_samples):
+            end = min(start + chunk_samples, total)
+            window_start = max(0, start - lookahead_samples)
+            window_end = min(total, end + lookahead_samples)
+            
+            prediction = worker.separate(waveform[window_start:window_end])
+            offset = start - window_start
+            for source_name, source_data in prediction.items():
+                if source_name not in result:
+                    result[source_name] = np.empty((total,) + source_data.shape[1:], dtype=source_data.dtype)
+                result[source_name][start:end] = source_data[offset:offset + end - start]
+        return result
+    
     def enhance_vocals(self, audio_data: np.ndarray, sample_rate: int, 
                       strength: float = 0.5) -> np.ndarray:
         """
@@ -243,11 +1238,18 @@ class AdvancedAudioEffects:
             accompaniment_gain = 1.0 - (strength * 0.3)  # Reduce accompaniment slightly as vocals increase
             
             # Mix
-            mixed = (enhanced_vocals * vocal_gain + accompaniment * accompaniment_gain) / 2
+            if NUMEXPR_AVAILABLE:
+                # One fused, multi-threaded pass instead of four temporaries. numexpr
+                # treats Python floats as doubles, so the gains are passed as
+                # float32 and the halving uses an integer literal to keep float32.
+                mixed = ne.evaluate("(ev * vg + acc * ag) / 2",
+                                    local_dict={'ev': enhanced_vocals, 'vg': _DTYPE(vocal_gain),
+                                                'acc': accompaniment, 'ag': _DTYPE(accompaniment_gain)})
+            else:
+                mixed = (enhanced_vocals * vocal_gain + accompaniment * accompaniment_gain) / 2
             
             # Prevent clipping
-            if np.max(np.abs(mixed)) > 0.99:
-                mixed = mixed / np.max(np.abs(mixed)) * 0.99
+            _peak_normalize(mixed)
             
             return mixed
             
@@ -330,14 +1332,17 @@ class AdvancedAudioEffects:
             if instrument == 'vocals' and 'accompaniment' in sources:
                 return sources['accompaniment']
                 
-            # For other instruments, we need to mix all sources except the one to remove
+            # For other instruments, we need to mix all sources except the one to remove,
+            # summed in place into a single output buffer
             result = None
             for source_name, source_data in sources.items():
-                if source_name != instrument and source_name != 'original':
-                    if result is None:
-                        result = source_data.copy()
-                    else:
-                        result += source_data
+                if source_name in (instrument, 'original'):
+                    continue
+                if result is None:
+                    result = np.empty_like(source_data)
+                    np.copyto(result, source_data)
+                else:
+                    np.add(result, source_data, out=result)
             
             # If we couldn't remove the instrument, return the original
             if result is None:
@@ -345,8 +1350,7 @@ class AdvancedAudioEffects:
                 return audio_data
                 
             # Normalize to prevent clipping
-            if np.max(np.abs(result)) > 0.99:
-                result = result / np.max(np.abs(result)) * 0.99
+            _peak_normalize(result)
                 
             return result
                 
@@ -372,34 +1376,48 @@ class AdvancedAudioEffects:
             return audio_data
             
         try:
-            # Convert to mono if stereo
+            # Convert to mono if stereo (in float32, so the STFT is complex64)
             if len(audio_data.shape) > 1:
-                audio_mono = np.mean(audio_data, axis=1)
+                audio_mono = np.mean(audio_data, axis=1, dtype=_DTYPE)
             else:
-                audio_mono = audio_data
+                audio_mono = np.asarray(audio_data, dtype=_DTYPE)
                 
-            # Compute spectrogram
-            stft = librosa.stft(audio_mono)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Estimate noise profile from the quietest frames
-            noise_threshold = np.percentile(magnitude, 5, axis=1)
-            noise_threshold = noise_threshold.reshape(-1, 1)
-            
-            # Apply spectral gating
-            mask = (magnitude > noise_threshold * (1 + strength * 3))
-            
-            # Apply mask to spectrogram
-            magnitude_denoised = magnitude * mask
-            
-            # Reconstruct audio
-            stft_denoised = magnitude_denoised * np.exp(1j * phase)
-            audio_denoised = librosa.istft(stft_denoised, length=len(audio_mono))
+            # scipy's STFT runs on pocketfft; spread the FFTs over all cores
+            with scipy.fft.set_workers(os.cpu_count() or 1):
+                # Compute spectrogram (frames shrink to fit very short clips)
+                n_fft = min(_DENOISE_N_FFT, len(audio_mono))
+                noverlap = n_fft - max(1, n_fft * _DENOISE_HOP // _DENOISE_N_FFT)
+                _, _, stft = scipy.signal.stft(audio_mono, nperseg=n_fft, noverlap=noverlap)
+                if self.fallback_dsp_available:
+                    # Noise floor estimate and gating fused into one parallel pass
+                    fallback_dsp.spectral_gate(stft, int(0.05 * (stft.shape[1] - 1)), 1 + strength * 3)
+                else:
+                    # Gate a tile of frequency rows at a time, so each tile's
+                    # magnitudes stay in L2 between the threshold and the gating
+                    rows = max(1, _DENOISE_TILE_BYTES // (stft.shape[1] * stft.itemsize))
+                    for row in range(0, stft.shape[0], rows):
+                        tile = stft[row:row + rows]
+                        magnitude = np.abs(tile)
+                        
+                        # Estimate noise profile from the quietest frames
+                        noise_threshold = np.quantile(magnitude, 0.05, axis=1, keepdims=True,
+                                                      method='lower') * (1 + strength * 3)
+                        
+                        # Apply spectral gating directly to the complex spectrogram; the
+                        # phase of the surviving bins is untouched
+                        tile[magnitude <= noise_threshold] = 0
+                
+                # Reconstruct audio
+                _, audio_denoised = scipy.signal.istft(stft, nperseg=n_fft, noverlap=noverlap)
+            audio_denoised = audio_denoised[:len(audio_mono)]
             
             # If original was stereo, convert back to stereo
             if len(audio_data.shape) > 1:
-                audio_denoised = np.tile(audio_denoised.reshape(-1, 1), (1, audio_data.shape[1]))
+                # Callers own the result, so it is a real (writable) array; the
+                # mono signal is broadcast straight into it without temporaries
+                audio_stereo = np.empty((audio_denoised.shape[0], audio_data.shape[1]), dtype=audio_denoised.dtype)
+                audio_stereo[...] = audio_denoised[:, None]
+                audio_denoised = audio_stereo
                 
             return audio_denoised
                 
@@ -420,8 +1438,8 @@ class AdvancedAudioEffects:
         Returns:
             Harmonized audio as numpy array
         """
-        if not self.spleeter_available or not self.librosa_available:
-            logger.warning("Spleeter or Librosa not available. Cannot harmonize audio.")
+        if not self.spleeter_available or not (self.pedalboard_available or self.librosa_available):
+            logger.warning("Spleeter or a pitch shifter (Pedalboard/Librosa) not available. Cannot harmonize audio.")
             return audio_data
             
         try:
@@ -436,26 +1454,25 @@ class AdvancedAudioEffects:
             accompaniment = sources['accompaniment']
             
             # Create harmonies by pitch shifting
-            harmonies = []
-            for semitone in semitones:
-                harmony = librosa.effects.pitch_shift(vocals, sr=sample_rate, n_steps=semitone)
-                harmonies.append(harmony * 0.6)  # Reduce volume of harmonies
+            if self.pedalboard_available:
+                harmonies = self._pitch_shift_pedalboard(vocals, sample_rate, semitones)
+            else:
+                harmonies = self._pitch_shift_many(vocals, sample_rate, semitones)
             
             # Mix original vocals with harmonies
-            mixed_vocals = vocals.copy()
-            for harmony in harmonies:
-                mixed_vocals += harmony
+            mixed_vocals = np.array(vocals, dtype=_DTYPE)
+            if harmonies:
+                harmony_sum = np.sum(harmonies, axis=0, dtype=_DTYPE)
+                mixed_vocals += 0.6 * harmony_sum  # Reduce volume of harmonies
                 
             # Normalize vocals to prevent clipping
-            if np.max(np.abs(mixed_vocals)) > 0.99:
-                mixed_vocals = mixed_vocals / np.max(np.abs(mixed_vocals)) * 0.99
+            _peak_normalize(mixed_vocals)
             
             # Mix harmonized vocals with accompaniment
             result = mixed_vocals + accompaniment
             
             # Normalize final mix to prevent clipping
-            if np.max(np.abs(result)) > 0.99:
-                result = result / np.max(np.abs(result)) * 0.99
+            _peak_normalize(result)
                 
             return result
                 
@@ -463,132 +1480,82 @@ class AdvancedAudioEffects:
             logger.error(f"Error harmonizing audio: {str(e)}")
             return audio_data
     
-    def _add_eq_to_board(self, board: Pedalboard, params: Dict[str, Any]) -> None:
-        """Add EQ effects to the pedalboard"""
-        # Low shelf
-        if 'low' in params and params['low'] != 0:
-            board.append(LadderFilter(
-                mode=LadderFilter.Mode.LOW_SHELF,
-                cutoff_hz=250,
-                resonance=0.7,
-                gain_db=params['low']
-            ))
-        
-        # Low mid
-        if 'low_mid' in params and params['low_mid'] != 0:
-            board.append(LadderFilter(
-                mode=LadderFilter.Mode.BAND_SHELF,
-                cutoff_hz=500,
-                resonance=0.7,
-                gain_db=params['low_mid']
-            ))
-        
-        # Mid
-        if 'mid' in params and params['mid'] != 0:
-            board.append(LadderFilter(
-                mode=LadderFilter.Mode.BAND_SHELF,
-                cutoff_hz=1000,
-                resonance=0.7,
-                gain_db=params['mid']
-            ))
-        
-        # High mid
-        if 'high_mid' in params and params['high_mid'] != 0:
-            board.append(LadderFilter(
-                mode=LadderFilter.Mode.BAND_SHELF,
-                cutoff_hz=2500,
-                resonance=0.7,
-                gain_db=params['high_mid']
-            ))
-        
-        # High shelf
-        if 'high' in params and params['high'] != 0:
-            board.append(LadderFilter(
-                mode=LadderFilter.Mode.HIGH_SHELF,
-                cutoff_hz=5000,
-                resonance=0.7,
-                gain_db=params['high']
-            ))
-    
-    def _create_compressor(self, params: Dict[str, Any]) -> Compressor:
-        """Create a compressor effect"""
-        return Compressor(
-            threshold_db=params.get('threshold', -20),
-            ratio=params.get('ratio', 4),
-            attack_ms=params.get('attack', 20),
-            release_ms=params.get('release', 250)
-        )
-    
-    def _create_reverb(self, params: Dict[str, Any]) -> Reverb:
-        """Create a reverb effect"""
-        return Reverb(
-            room_size=params.get('room_size', 0.5),
-            damping=params.get('damping', 0.5),
-            wet_level=params.get('wet_level', 0.33),
-            dry_level=params.get('dry_level', 0.7),
-            width=params.get('width', 1.0),
-            freeze_mode=params.get('freeze_mode', 0.0)
-        )
-    
-    def _create_delay(self, params: Dict[str, Any]) -> Delay:
-        """Create a delay effect"""
-        return Delay(
-            delay_seconds=params.get('time', 0.25),
-            feedback=params.get('feedback', 0.3),
-            mix=params.get('mix', 0.3)
-        )
-    
-    def _create_distortion(self, params: Dict[str, Any]) -> Distortion:
-        """Create a distortion effect"""
-        return Distortion(
-            drive_db=20 * np.log10(params.get('drive', 2.0)),  # Convert from linear to dB
-        )
-    
-    def _create_chorus(self, params: Dict[str, Any]) -> Chorus:
-        """Create a chorus effect"""
-        return Chorus(
-            rate_hz=params.get('rate', 1.0),
-            depth=params.get('depth', 0.25),
-            centre_delay_ms=params.get('delay', 7.0),
-            feedback=params.get('feedback', 0.0),
-            mix=params.get('mix', 0.5)
-        )
-    
-    def _create_phaser(self, params: Dict[str, Any]) -> Phaser:
-        """Create a phaser effect"""
-        return Phaser(
-            rate_hz=params.get('rate', 1.0),
-            depth=params.get('depth', 0.5),
-            centre_frequency_hz=params.get('center_freq', 1300),
-            feedback=params.get('feedback', 0.0),
-            mix=params.get('mix', 0.5)
-        )
-    
-    def _create_filter(self, params: Dict[str, Any]) -> LadderFilter:
-        """Create a filter effect"""
-        filter_type = params.get('type', 'bandpass')
-        
-        if filter_type == 'lowpass':
-            mode = LadderFilter.Mode.LOW_PASS
-            cutoff = params.get('cutoff_high', 1000)
-        elif filter_type == 'highpass':
-            mode = LadderFilter.Mode.HIGH_PASS
-            cutoff = params.get('cutoff_low', 1000)
-        else:  # bandpass
-            mode = LadderFilter.Mode.BAND_PASS
-            cutoff = (params.get('cutoff_low', 500) + params.get('cutoff_high', 3000)) / 2
-        
-        return LadderFilter(
-            mode=mode,
-            cutoff_hz=cutoff,
-            resonance=params.get('resonance', 0.7)
-        )
-    
-    def _create_pitch_shift(self, params: Dict[str, Any]) -> PitchShift:
-        """Create a pitch shift effect"""
-        return PitchShift(
-            semitones=params.get('semitones', 0)
-        )
-
-# Create singleton instance
-advanced_effects = AdvancedAudioEffects()
\ No newline at end of file
+    def _pitch_shift_pedalboard(self, audio_data: np.ndarray, sample_rate: int,
+                                semitones: List[int]) -> List[np.ndarray]:
+        """
+        Pitch shift one signal by several amounts with Pedalboard, one thread per shift
+        
+        Pedalboard's PitchShift works in the time domain and releases the GIL
+        while processing, so the shifts run truly in parallel.
+        
+        Args:
+            audio_data: Audio samples, (samples,) or (samples, channels)
+            sample_rate: Sample rate in Hz
+            semitones: Semitone shift for each output
+            
+        Returns:
+            List of shifted signals, each shaped like audio_data
+        """
+        if not semitones:
+            return []
+        
+        audio_pb = np.ascontiguousarray(audio_data.T if audio_data.ndim > 1 else audio_data[np.newaxis, :],
+                                        dtype=_DTYPE)
+        boards = [self._build_board([{'type': 'pitch_shift', 'parameters': {'semitones': semitone}}],
+                                    use_effect_cache=False)
+                  for semitone in semitones]
+        with ThreadPoolExecutor(max_workers=len(boards)) as executor:
+            shifted = list(executor.map(lambda board: board.process(audio_pb, sample_rate), boards))
+        
+        return [shift.T if audio_data.ndim > 1 else shift[0] for shift in shifted]
+    
+    def _pitch_shift_many(self, audio_data: np.ndarray, sample_rate: int,
+                          semitones: List[int]) -> List[np.ndarray]:
+        """
+        Pitch shift one signal by several amounts, sharing a single STFT
+        
+        Equivalent to calling librosa.effects.pitch_shift once per shift, but
+        the forward STFT of the input is only computed once.
+        
+        Args:
+            audio_data: Audio samples, (samples,) or (samples, channels)
+            sample_rate: Sample rate in Hz
+            semitones: Semitone shift for each output
+            
+        Returns:
+            List of shifted signals, each shaped like audio_data
+        """
+        # librosa works on (..., samples); float32 keeps the STFT in complex64
+        y = np.asarray(audio_data.T if audio_data.ndim > 1 else audio_data, dtype=_DTYPE)
+        stft = librosa.stft(y)
+        
+        shifted = []
+        for semitone in semitones:
+            rate = 2.0 ** (-float(semitone) / 12)
+            # Stretch in time by phase vocoding, then resample back to the original pitch grid
+            stretched = librosa.istft(librosa.phase_vocoder(stft, rate=rate), dtype=y.dtype,
+                                      length=int(round(y.shape[-1] / rate)))
+            shift = librosa.resample(stretched, orig_sr=float(sample_rate) / rate, target_sr=sample_rate)
+            shift = librosa.util.fix_length(shift, size=y.shape[-1])
+            shifted.append(shift.T if audio_data.ndim > 1 else shift)
+        return shifted
+    
+    def _build_eq_plugins(self, params: Dict[str, Any], reuse: bool = True,
+                          in_use: Optional[set] = None) -> List[Any]:
+        """Build the biquad stages implementing an EQ setting"""
+        # Only bands with an audible gain get a filter stage; every stage is a
+        # full pass over the buffer, so slider noise around 0 dB is dropped
+        return [self._make_effect('eq_band', {'plugin': plugin_name, 'cutoff_hz': cutoff_hz,
+                                              'gain_db': params[band]}, reuse, in_use)
+                for band, plugin_name, cutoff_hz in _EQ_TABLE
+                if abs(params.get(band, 0.0)) > _EQ_GAIN_EPSILON_DB]
+
+# Per-thread instances, so effect caches are never shared between workers
+_thread_local = threading.local()
+
+def get_advanced_effects() -> AdvancedAudioEffects:
+    """Return the calling thread's AdvancedAudioEffects instance"""
+    effects = getattr(_thread_local, 'effects', None)
+    if effects is None:
+        effects = _thread_local.effects = AdvancedAudioEffects()
+    return effects
\ No newline at end of file
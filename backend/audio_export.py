@@ -5,30 +5,211 @@ This module provides functions for exporting audio in various formats
 with different quality settings.
 """
 
+import asyncio
+import io
 import os
+import shutil
+import subprocess
+import tempfile
 import numpy as np
 import soundfile as sf
 import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, ClassVar, List, Optional, Tuple
+
+import _fallback_dsp as fallback_dsp
 
 logger = logging.getLogger(__name__)
 
+# Lossy formats are encoded by piping raw PCM into the ffmpeg binary
+FFMPEG_PATH = shutil.which('ffmpeg')
+ADVANCED_EXPORT_AVAILABLE = FFMPEG_PATH is not None
+if not ADVANCED_EXPORT_AVAILABLE:
+    logger.warning("ffmpeg not installed. Some export formats may not be available.")
+
 try:
-    import ffmpeg
-    from pydub import AudioSegment
-    ADVANCED_EXPORT_AVAILABLE = True
+    # Import lameenc to encode MP3 in-process instead of starting ffmpeg
+    import lameenc
+    LAMEENC_AVAILABLE = True
 except ImportError:
-    logger.warning("ffmpeg or pydub not installed. Some export formats may not be available.")
-    ADVANCED_EXPORT_AVAILABLE = False
+    LAMEENC_AVAILABLE = False
+
+# LAME's default VBR mode (vbr_mtrh)
+_LAME_VBR_MODE = 4
+
+# Raw sample format fed to ffmpeg: interleaved little-endian float32 ('f32le')
+_PIPE_DTYPE = np.dtype('<f4')
+
+# Inputs larger than this are staged in a raw memory-mapped file for ffmpeg
+# to read itself, instead of being pushed through its stdin
+_RAW_STAGING_BYTES = 256 * 1024 * 1024
+
+# Size of the writes that feed PCM to ffmpeg's stdin
+_PIPE_CHUNK_BYTES = 1024 * 1024
+
+# Container ffmpeg muxes each encoded format into; WAV and FLAC are written
+# by libsndfile and do not need ffmpeg
+_CONTAINERS = {'mp3': 'mp3', 'ogg': 'ogg', 'aac': 'adts'}
+
+# RIFF size fields are 32-bit; WAV data past this is written as RF64
+_WAV_MAX_DATA_BYTES = 2**32 - 4096
+
+# Frames written to libsndfile per call when exporting WAV or FLAC
+_WRITE_BLOCK_FRAMES = 65536
+
+# Bytes per sample of each WAV subtype
+_WAV_SAMPLE_BYTES = {'PCM_16': 2, 'PCM_24': 3, 'FLOAT': 4}
+
+def _uses_ffmpeg(format: str) -> bool:
+    """Whether a format is encoded by the ffmpeg binary"""
+    return format in _CONTAINERS and not (format == 'mp3' and LAMEENC_AVAILABLE)
+
+# Integer container handed to libsndfile for each fixed-point WAV subtype
+_WAV_INT_DTYPES = {'PCM_16': np.int16, 'PCM_24': np.int32}
+
+def _drop_page_cache(output_path) -> None:
+    """Flush an exported file and drop it from the page cache"""
+    # Exports are served or downloaded later, so keeping them cached only
+    # evicts the inputs and models the server does reuse. DONTNEED skips
+    # dirty pages and the kernel does not revisit them once they are
+    # written back, so flush the data first.
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(output_path, os.O_RDONLY)
+    try:
+        os.fdatasync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def _write_output(output_path: Path, data: bytes) -> None:
+    """Write an exported file and release its page cache"""
+    output_path.write_bytes(data)
+    _drop_page_cache(output_path)
+
+def _prepare_pcm(audio_data: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Bring audio into the one layout every writer consumes
+    
+    Args:
+        audio_data: Audio samples, mono, (samples, channels) or (channels, samples)
+        
+    Returns:
+        Tuple of (C-contiguous interleaved samples, number of channels); float
+        input is converted to float32, and nothing is copied if it already fits
+    """
+    # librosa returns multichannel audio channels-first
+    if audio_data.ndim == 2 and audio_data.shape[0] < audio_data.shape[1]:
+        audio_data = audio_data.T
+    
+    if np.issubdtype(audio_data.dtype, np.floating):
+        pcm = np.ascontiguousarray(audio_data, dtype=_PIPE_DTYPE)
+    else:
+        pcm = np.ascontiguousarray(audio_data)
+    return pcm, 1 if pcm.ndim == 1 else pcm.shape[1]
+
+def _pipe_pcm(pcm: np.ndarray) -> np.ndarray:
+    """Convert interleaved PCM to the float32 ffmpeg reads, scaling integers to [-1.0, 1.0)"""
+    if np.issubdtype(pcm.dtype, np.signedinteger):
+        # Same full scale libsndfile uses when it reads integer PCM as float
+        return np.multiply(pcm, np.float32(1 / -np.iinfo(pcm.dtype).min), dtype=_PIPE_DTYPE)
+    return pcm.astype(_PIPE_DTYPE, copy=False)
+
+def _feed_stdin(pipe, pcm: np.ndarray) -> None:
+    """Write a contiguous array to a pipe in chunks, without copying it to bytes, then close it"""
+    view = memoryview(pcm).cast('B')
+    try:
+        for start in range(0, len(view), _PIPE_CHUNK_BYTES):
+            pipe.write(view[start:start + _PIPE_CHUNK_BYTES])
+    except BrokenPipeError:
+        # ffmpeg exited early; its return code and stderr report why
+        pass
+    finally:
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+
+def _quantize(audio_data: np.ndarray, subtype: str) -> np.ndarray:
+    """
+    Convert float samples to the integer container libsndfile writes as-is
+    
+    Args:
+        audio_data: Float audio samples in [-1.0, 1.0]
+        subtype: 'PCM_16' or 'PCM_24'
+        
+    Returns:
+        int16 samples, or 24-bit samples left-aligned in int32
+    """
+    bits = 16 if subtype == 'PCM_16' else 24
+    # Same scale and clipping as libsndfile's own float conversion. PCM_16
+    # matches it bit for bit; libsndfile rounds 24-bit values where this
+    # floors, so PCM_24 can differ from it by one LSB on a few samples
+    scale = np.float32(1 << (bits - 1))
+    # libsndfile reads int32 as full scale and keeps the top 24 bits
+    shift = 32 - bits if bits == 24 else 0
+    
+    if fallback_dsp.NUMBA_AVAILABLE:
+        # One fused pass instead of NumPy's multiply/floor/clip/cast temporaries
+        samples = np.ascontiguousarray(audio_data)
+        pcm = np.empty(samples.shape, dtype=_WAV_INT_DTYPES[subtype])
+        fallback_dsp.quantize_pcm(samples.reshape(-1), scale, shift, pcm.reshape(-1))
+        return pcm
+    
+    scaled = np.multiply(audio_data, scale, dtype=np.float32)
+    np.floor(scaled, out=scaled)
+    np.clip(scaled, -scale, scale - 1, out=scaled)
+    pcm = scaled.astype(_WAV_INT_DTYPES[subtype])
+    pcm <<= shift
+    return pcm
+
+def _export_shared(export_dir: str, shm_name: str, shape: Tuple[int, ...], dtype: str,
+                   job: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one export_many job in a worker process, on audio held in shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio_data = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        result = AudioExporter(Path(export_dir)).export_audio(audio_data, **job)
+        # The view must be gone before the segment can be closed
+        del audio_data
+        return result
+    finally:
+        shm.close()
 
 class AudioExporter:
     """Audio exporter for various formats and quality settings"""
     
+    # Constant bitrate per (format, quality), for encoders run in CBR mode
+    _BITRATES: ClassVar[Dict[Tuple[str, str], str]] = {
+        ('aac', 'low'): "128k", ('aac', 'medium'): "192k", ('aac', 'high'): "256k",
+    }
+    
+    # VBR quality (-q:a) per (format, quality): LAME V5/V3/V0 (~130/175/245
+    # kbps) and Vorbis q3/q6/q10, smaller than CBR at the same quality
+    _QUALITY_PARAMETERS: ClassVar[Dict[Tuple[str, str], str]] = {
+        ('mp3', 'low'): "5", ('mp3', 'medium'): "3", ('mp3', 'high'): "0",
+        ('ogg', 'low'): "3", ('ogg', 'medium'): "6", ('ogg', 'high'): "10",
+    }
+    
     def __init__(self, export_dir: Path):
         self.export_dir = export_dir
         self.export_dir.mkdir(exist_ok=True)
         self.advanced_export_available = ADVANCED_EXPORT_AVAILABLE
+        
+        # export_many's worker processes, kept alive between calls so each
+        # batch does not pay for starting and importing in new interpreters
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._process_pool_workers = 0
+        self._process_pool_lock = threading.Lock()
+        
+        # libsndfile releases the GIL while encoding, so WAV/FLAC writes run
+        # here alongside ffmpeg encodes instead of after them
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='audio-export-io')
     
     def export_audio(self, audio_data: np.ndarray, sample_rate: int, 
                     file_id: str, format: str = 'wav', 
@@ -41,24 +222,15 @@ class AudioExporter:
             sample_rate: Sample rate in Hz
             file_id: Unique identifier for the file
             format: Output format ('wav', 'mp3', 'flac', 'ogg', 'aac')
-            quality: Quality setting ('low', 'medium', 'high')
+            quality: Quality setting ('low', 'medium', 'high'; 'master' for
+                32-bit float WAV)
             
         Returns:
             Dict with export details
         """
         try:
-            # Normalize format string
-            format = format.lower()
-            
-            # Validate format
-            if format not in ['wav', 'mp3', 'flac', 'ogg', 'aac']:
-                logger.warning(f"Unsupported format: {format}. Falling back to wav.")
-                format = 'wav'
-            
-            # For formats other than wav, we need ffmpeg/pydub
-            if format != 'wav' and not self.advanced_export_available:
-                logger.warning(f"Format {format} requires ffmpeg/pydub. Falling back to wav.")
-                format = 'wav'
+            format = self._resolve_format(format)
+            audio_data, _ = _prepare_pcm(audio_data)
             
             # Create output filename
             output_path = self.export_dir / f"{file_id}.{format}"
@@ -66,8 +238,10 @@ class AudioExporter:
             # Export based on format
             if format == 'wav':
                 return self._export_wav(audio_data, sample_rate, output_path, quality)
+            elif format == 'flac':
+                return self._export_flac(audio_data, sample_rate, output_path, quality)
             else:
-                return self._export_with_pydub(audio_data, sample_rate, output_path, format, quality)
+                return self._export_with_ffmpeg(audio_data, sample_rate, output_path, format, quality)
                 
         except Exception as e:
             logger.error(f"Error exporting audio: {str(e)}")
@@ -75,21 +249,251 @@ class AudioExporter:
             output_path = self.export_dir / f"{file_id}.wav"
             return self._export_wav(audio_data, sample_rate, output_path, 'medium')
     
+    async def export_audio_async(self, audio_data: np.ndarray, sample_rate: int,
+                                 file_id: str, format: str = 'wav',
+                                 quality: str = 'high') -> Dict[str, Any]:
+        """
+        Export audio like export_audio without blocking the event loop
+        
+        ffmpeg encodes run as asyncio subprocesses, so one loop can drive many
+        concurrent exports; WAV, FLAC and in-process MP3 run on a worker thread.
+        
+        Args:
+            audio_data: Audio samples as numpy array
+            sample_rate: Sample rate in Hz
+            file_id: Unique identifier for the file
+            format: Output format ('wav', 'mp3', 'flac', 'ogg', 'aac')
+            quality: Quality setting ('low', 'medium', 'high'; 'master' for
+                32-bit float WAV)
+            
+        Returns:
+            Dict with export details
+        """
+        try:
+            format = self._resolve_format(format)
+            if not _uses_ffmpeg(format):
+                return await asyncio.to_thread(self.export_audio, audio_data, sample_rate,
+                                               file_id, format, quality)
+            
+            output_path = self.export_dir / f"{file_id}.{format}"
+            await self._run_ffmpeg_async(audio_data, sample_rate, format, quality, str(output_path))
+            await asyncio.to_thread(_drop_page_cache, output_path)
+            return self._encoded_result(output_path, format, quality, sample_rate)
+        
+        except Exception as e:
+            logger.error(f"Error exporting audio: {str(e)}")
+            # Fallback to WAV export
+            output_path = self.export_dir / f"{file_id}.wav"
+            return await asyncio.to_thread(self._export_wav, audio_data, sample_rate,
+                                           output_path, 'medium')
+    
+    def export_many(self, jobs: List[Dict[str, Any]],
+                    max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Run several exports in parallel worker processes
+        
+        Each distinct audio array is copied into shared memory once, however
+        many jobs use it, instead of being pickled to the workers per job.
+        The worker processes are reused by later calls with the same
+        max_workers.
+        
+        Args:
+            jobs: Keyword arguments for export_audio, one dict per export
+                (audio_data, sample_rate, file_id, format, quality)
+            max_workers: Number of worker processes (default: CPU count)
+            
+        Returns:
+            Export details for each job, in input order
+        """
+        if not jobs:
+            return []
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        segments: Dict[int, Tuple[shared_memory.SharedMemory, Tuple[int, ...], str]] = {}
+        futures = {}
+        executor = self._get_process_pool(max_workers or os.cpu_count())
+        try:
+            for index, job in enumerate(jobs):
+                job = dict(job)
+                audio_data = job.pop('audio_data')
+                segment = segments.get(id(audio_data))
+                if segment is None:
+                    pcm, _ = _prepare_pcm(audio_data)
+                    shm = shared_memory.SharedMemory(create=True, size=max(1, pcm.nbytes))
+                    np.ndarray(pcm.shape, dtype=pcm.dtype, buffer=shm.buf)[...] = pcm
+                    segment = segments[id(audio_data)] = (shm, pcm.shape, pcm.dtype.str)
+                
+                shm, shape, dtype = segment
+                future = executor.submit(_export_shared, str(self.export_dir), shm.name, shape, dtype, job)
+                futures[future] = index
+            
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool on the next call
+            with self._process_pool_lock:
+                if self._process_pool is executor:
+                    self._process_pool = None
+            raise
+        finally:
+            # Jobs still queued after a failure must not find their segment gone
+            wait(futures)
+            for shm, _, _ in segments.values():
+                shm.close()
+                shm.unlink()
+        
+        return results
+    
+    def _get_process_pool(self, max_workers: int) -> ProcessPoolExecutor:
+        """Get the persistent export_many worker pool, (re)creating it for a new size"""
+        with self._process_pool_lock:
+            if self._process_pool is None or self._process_pool_workers != max_workers:
+                if self._process_pool is not None:
+                    self._process_pool.shutdown(wait=False)
+                # Spawned rather than forked: forking after the Numba kernels
+                # have started OpenMP threads aborts the child
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+                self._process_pool_workers = max_workers
+            return self._process_pool
+    
+    def export_multi_format(self, audio_data: np.ndarray, sample_rate: int, file_id: str,
+                            targets: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Export one signal to several formats and qualities at once
+        
+        All ffmpeg targets are encoded by a single ffmpeg process with one
+        output per target, so the PCM is converted and piped only once; WAV
+        and FLAC targets (and MP3 with lameenc) are written on I/O threads
+        while ffmpeg runs.
+        
+        Args:
+            audio_data: Audio samples as numpy array
+            sample_rate: Sample rate in Hz
+            file_id: Unique identifier; files are named {file_id}_{quality}.{format}
+            targets: (format, quality) pairs to export
+            
+        Returns:
+            List of export details, one per target, in target order
+        """
+        targets = [(format.lower(), quality) for format, quality in targets]
+        # Every target reuses the one interleaved float32 buffer
+        audio_data, _ = _prepare_pcm(audio_data)
+        encoded = [(index, format, quality) for index, (format, quality) in enumerate(targets)
+                   if _uses_ffmpeg(format)]
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        written = {index: self._io_pool.submit(self.export_audio, audio_data, sample_rate,
+                                               f"{file_id}_{quality}", format, quality)
+                   for index, (format, quality) in enumerate(targets) if not _uses_ffmpeg(format)}
+        if encoded and self.advanced_export_available:
+            outputs = [(format, quality, str(self.export_dir / f"{file_id}_{quality}.{format}"))
+                       for _, format, quality in encoded]
+            try:
+                self._run_ffmpeg(audio_data, sample_rate, outputs)
+                for (index, _, _), (format, quality, output_path) in zip(encoded, outputs):
+                    _drop_page_cache(output_path)
+                    results[index] = self._encoded_result(Path(output_path), format, quality, sample_rate)
+            except Exception as e:
+                logger.error(f"Error exporting audio: {str(e)}")
+        
+        for index, future in written.items():
+            results[index] = future.result()
+        
+        # Anything ffmpeg could not produce goes through export_audio
+        for index, (format, quality) in enumerate(targets):
+            if results[index] is None:
+                results[index] = self.export_audio(audio_data, sample_rate, f"{file_id}_{quality}",
+                                                   format, quality)
+        return results
+    
+    def encode_to_bytes(self, audio_data: np.ndarray, sample_rate: int,
+                        format: str = 'wav', quality: str = 'high') -> bytes:
+        """
+        Encode audio in memory, without touching the disk
+        
+        Args:
+            audio_data: Audio samples as numpy array
+            sample_rate: Sample rate in Hz
+            format: Output format ('wav', 'mp3', 'flac', 'ogg', 'aac')
+            quality: Quality setting ('low', 'medium', 'high'; 'master' for
+                32-bit float WAV)
+            
+        Returns:
+            The encoded file contents
+        """
+        format = format.lower()
+        audio_data, _ = _prepare_pcm(audio_data)
+        if format in ('wav', 'flac'):
+            buffer = io.BytesIO()
+            self._write_sndfile(audio_data, sample_rate, buffer, format, quality)
+            return buffer.getvalue()
+        
+        if format not in _CONTAINERS:
+            raise ValueError(f"Unsupported format: {format}")
+        if format == 'mp3' and LAMEENC_AVAILABLE:
+            return self._encode_mp3(audio_data, sample_rate, quality)
+        if not self.advanced_export_available:
+            raise RuntimeError(f"Format {format} requires ffmpeg")
+        return self._run_ffmpeg(audio_data, sample_rate, [(format, quality, 'pipe:1')])
+    
+    def _write_sndfile(self, audio_data: np.ndarray, sample_rate: int, destination,
+                       format: str, quality: str) -> None:
+        """
+        Write WAV or FLAC with libsndfile
+        
+        Args:
+            audio_data: Interleaved samples from _prepare_pcm
+            sample_rate: Sample rate in Hz
+            destination: File path or writable file object
+            format: 'wav' or 'flac'
+            quality: Quality setting ('low', 'medium', 'high'; 'master' for
+                32-bit float WAV)
+        """
+        container = format.upper()
+        if format == 'wav':
+            subtype, compression_level = self._get_wav_subtype(quality), None
+            # Plain WAV would overflow its size fields and come out corrupt
+            if audio_data.size * _WAV_SAMPLE_BYTES[subtype] > _WAV_MAX_DATA_BYTES:
+                container = 'RF64'
+        else:
+            subtype, compression_level = self._get_flac_settings(quality)
+        # Quantize float input ourselves so libsndfile only copies integers
+        # out instead of converting every sample itself; block by block, so
+        # no file-sized buffer is held alongside the input
+        quantize = subtype in _WAV_INT_DTYPES and np.issubdtype(audio_data.dtype, np.floating)
+        channels = 1 if audio_data.ndim == 1 else audio_data.shape[1]
+        with sf.SoundFile(destination, 'w', sample_rate, channels, subtype=subtype,
+                          format=container, compression_level=compression_level) as sound_file:
+            for start in range(0, len(audio_data), _WRITE_BLOCK_FRAMES):
+                block = audio_data[start:start + _WRITE_BLOCK_FRAMES]
+                sound_file.write(_quantize(block, subtype) if quantize else block)
+    
+    def _resolve_format(self, format: str) -> str:
+        """Normalize a requested format, falling back to WAV where it cannot be produced"""
+        # Normalize format string
+        format = format.lower()
+        
+        # Validate format
+        if format not in ['wav', 'mp3', 'flac', 'ogg', 'aac']:
+            logger.warning(f"Unsupported format: {format}. Falling back to wav.")
+            format = 'wav'
+        
+        # For lossy formats, we need ffmpeg
+        if _uses_ffmpeg(format) and not self.advanced_export_available:
+            logger.warning(f"Format {format} requires ffmpeg. Falling back to wav.")
+            format = 'wav'
+        
+        return format
+    
     def _export_wav(self, audio_data: np.ndarray, sample_rate: int, 
                    output_path: Path, quality: str) -> Dict[str, Any]:
         """Export audio in WAV format"""
-        # Set bit depth based on quality
-        if quality == 'low':
-            subtype = 'PCM_16'  # 16-bit
-        elif quality == 'medium':
-            subtype = 'PCM_24'  # 24-bit
-        else:  # high
-            subtype = 'FLOAT'   # 32-bit float
-        
-        # Write the file
-        sf.write(output_path, audio_data, sample_rate, subtype=subtype)
+        subtype = self._get_wav_subtype(quality)
         
-        # Get file size
+        # Write the file straight to disk and get its size
+        self._write_sndfile(audio_data, sample_rate, output_path, 'wav', quality)
+        _drop_page_cache(output_path)
         file_size = os.path.getsize(output_path)
         
         return {
@@ -102,87 +506,212 @@ class AudioExporter:
             "url": f"/audio/{output_path.name}"
         }
     
-    def _export_with_pydub(self, audio_data: np.ndarray, sample_rate: int,
-                          output_path: Path, format: str, quality: str) -> Dict[str, Any]:
-        """Export audio using pydub for formats other than WAV"""
-        # First save as temporary WAV
-        temp_wav = self.export_dir / f"temp_{output_path.stem}.wav"
-        sf.write(temp_wav, audio_data, sample_rate, subtype='FLOAT')
+    def _export_flac(self, audio_data: np.ndarray, sample_rate: int,
+                     output_path: Path, quality: str) -> Dict[str, Any]:
+        """Export audio in FLAC format with libsndfile's native encoder"""
+        subtype, _ = self._get_flac_settings(quality)
         
-        # Load with pydub
-        audio = AudioSegment.from_wav(temp_wav)
+        # Write the file straight to disk and get its size
+        self._write_sndfile(audio_data, sample_rate, output_path, 'flac', quality)
+        _drop_page_cache(output_path)
+        file_size = os.path.getsize(output_path)
         
-        # Set bitrate based on quality and format
-        bitrate = self._get_bitrate(format, quality)
+        return {
+            "path": str(output_path),
+            "format": "flac",
+            "quality": quality,
+            "sample_rate": sample_rate,
+            "bit_depth": 16 if subtype == 'PCM_16' else 24,
+            "file_size": file_size,
+            "url": f"/audio/{output_path.name}"
+        }
+    
+    def _export_with_ffmpeg(self, audio_data: np.ndarray, sample_rate: int,
+                           output_path: Path, format: str, quality: str) -> Dict[str, Any]:
+        """Export audio in a lossy format through ffmpeg (or lameenc for MP3)"""
+        if format == 'mp3' and LAMEENC_AVAILABLE:
+            # lameenc returns the encoded stream, which is far smaller than the PCM
+            data = self._encode_mp3(audio_data, sample_rate, quality)
+            _write_output(output_path, data)
+            return self._encoded_result(output_path, format, quality, sample_rate, len(data))
         
-        # Export with pydub
-        audio.export(
-            output_path,
-            format=format,
-            bitrate=bitrate,
-            parameters=["-q:a", self._get_quality_parameter(format, quality)]
-        )
+        # ffmpeg writes the output file itself
+        self._run_ffmpeg(audio_data, sample_rate, [(format, quality, str(output_path))])
+        _drop_page_cache(output_path)
+        return self._encoded_result(output_path, format, quality, sample_rate)
+    
+    def _encode_mp3(self, audio_data: np.ndarray, sample_rate: int, quality: str) -> bytes:
+        """Encode MP3 in-process with libmp3lame through lameenc, at the same VBR settings"""
+        pcm, channels = _prepare_pcm(audio_data)
+        if pcm.dtype != np.int16:
+            pcm = _quantize(pcm, 'PCM_16')
         
-        # Delete temporary WAV
-        os.remove(temp_wav)
+        encoder = lameenc.Encoder()
+        encoder.set_in_sample_rate(sample_rate)
+        encoder.set_channels(channels)
+        encoder.set_quality(2)  # Highest quality algorithm
+        encoder.set_vbr(_LAME_VBR_MODE)
+        encoder.set_vbr_quality(int(self._get_quality_parameter('mp3', quality)))
+        encoder.silence()
         
-        # Get file size
-        file_size = os.path.getsize(output_path)
+        return bytes(encoder.encode(pcm.tobytes()) + encoder.flush())
+    
+    def _run_ffmpeg(self, audio_data: np.ndarray, sample_rate: int,
+                    outputs: List[Tuple[str, str, str]]) -> bytes:
+        """
+        Encode audio with one ffmpeg process writing one stream per output
+        
+        Args:
+            audio_data: Audio samples as numpy array
+            sample_rate: Sample rate in Hz
+            outputs: (format, quality, destination) for each stream, where the
+                destination is a file path or 'pipe:1' for stdout
+                
+        Returns:
+            Whatever ffmpeg wrote to stdout
+        """
+        # ffmpeg reads interleaved (samples, channels) float32 straight from
+        # stdin or a raw file, so no temporary WAV is written or decoded
+        pcm, channels = _prepare_pcm(audio_data)
+        pcm = _pipe_pcm(pcm)
+        staged_path = None
+        if pcm.nbytes > _RAW_STAGING_BYTES:
+            staged_path = self._stage_raw(pcm)
+        
+        command = self._ffmpeg_command(sample_rate, channels, staged_path or 'pipe:0', outputs)
+        
+        try:
+            if staged_path:
+                process = subprocess.Popen(command, stdin=subprocess.DEVNULL,
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                stdout, stderr = process.communicate()
+            else:
+                process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                # Feed stdin from a thread so ffmpeg encodes while the PCM is
+                # still being written; communicate() only drains the outputs
+                stdin, process.stdin = process.stdin, None
+                writer = threading.Thread(target=_feed_stdin, args=(stdin, pcm), daemon=True)
+                writer.start()
+                try:
+                    stdout, stderr = process.communicate()
+                finally:
+                    writer.join()
+        finally:
+            if staged_path:
+                os.unlink(staged_path)
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with code {process.returncode}: "
+                               f"{stderr.decode(errors='replace').strip()}")
+        return stdout
+    
+    async def _run_ffmpeg_async(self, audio_data: np.ndarray, sample_rate: int,
+                                format: str, quality: str, destination: str = 'pipe:1') -> bytes:
+        """Encode audio with an ffmpeg process driven by the event loop; 'pipe:1' returns the bytes"""
+        pcm, channels = _prepare_pcm(audio_data)
+        pcm = _pipe_pcm(pcm)
+        command = self._ffmpeg_command(sample_rate, channels, 'pipe:0', [(format, quality, destination)])
+        
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+        # The transport accepts a memoryview, so the PCM is not copied to bytes
+        stdout, stderr = await process.communicate(memoryview(pcm).cast('B'))
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg exited with code {process.returncode}: "
+                               f"{stderr.decode(errors='replace').strip()}")
+        return stdout
+    
+    def _ffmpeg_command(self, sample_rate: int, channels: int, source: str,
+                        outputs: List[Tuple[str, str, str]]) -> List[str]:
+        """Build the ffmpeg command reading raw float32 PCM from source"""
+        command = [
+            FFMPEG_PATH, '-y', '-loglevel', 'error',
+            '-f', 'f32le', '-ar', str(sample_rate), '-ac', str(channels), '-i', source
+        ]
+        for format, quality, destination in outputs:
+            # Options apply to the output that follows them; -threads 0 lets
+            # encoders that can use several threads do so
+            command += ['-threads', '0']
+            bitrate = self._get_bitrate(format, quality)
+            if bitrate is None:
+                # VBR; passing -b:a as well would be ignored by LAME and
+                # Vorbis, while -q:a would switch the AAC encoder out of CBR
+                command += ['-q:a', self._get_quality_parameter(format, quality)]
+            else:
+                command += ['-b:a', bitrate]
+            command += ['-f', _CONTAINERS[format], str(destination)]
+        return command
+    
+    def _stage_raw(self, audio_data: np.ndarray) -> str:
+        """
+        Write audio to a temporary raw f32le file through a memory map
+        
+        Args:
+            audio_data: Audio samples as numpy array
+            
+        Returns:
+            Path of the raw file; the caller deletes it
+        """
+        with tempfile.NamedTemporaryFile(suffix='.raw', delete=False) as raw_file:
+            raw_path = raw_file.name
+        try:
+            staged = np.memmap(raw_path, dtype=_PIPE_DTYPE, mode='w+', shape=audio_data.shape)
+            staged[...] = audio_data
+            staged.flush()
+            del staged
+        except Exception:
+            os.unlink(raw_path)
+            raise
+        return raw_path
+    
+    def _encoded_result(self, output_path: Path, format: str, quality: str,
+                        sample_rate: int, file_size: Optional[int] = None) -> Dict[str, Any]:
+        """Build the export details for a lossy export"""
+        # Get file size, unless the caller wrote the file and already knows it
+        if file_size is None:
+            file_size = os.path.getsize(output_path)
         
         return {
             "path": str(output_path),
             "format": format,
             "quality": quality,
             "sample_rate": sample_rate,
-            "bitrate": bitrate,
+            "bitrate": self._get_bitrate(format, quality),
             "file_size": file_size,
             "url": f"/audio/{output_path.name}"
         }
     
-    def _get_bitrate(self, format: str, quality: str) -> str:
-        """Get appropriate bitrate for format and quality"""
-        if format == 'mp3':
-            if quality == 'low':
-                return "128k"
-            elif quality == 'medium':
-                return "192k"
-            else:  # high
-                return "320k"
-        elif format == 'ogg':
-            if quality == 'low':
-                return "96k"
-            elif quality == 'medium':
-                return "160k"
-            else:  # high
-                return "256k"
-        elif format == 'aac':
-            if quality == 'low':
-                return "128k"
-            elif quality == 'medium':
-                return "192k"
-            else:  # high
-                return "256k"
-        else:  # flac or other
-            return "320k"  # Not really used for FLAC
-    
-    def _get_quality_parameter(self, format: str, quality: str) -> str:
-        """Get format-specific quality parameter"""
-        if format == 'mp3':
-            if quality == 'low':
-                return "5"
-            elif quality == 'medium':
-                return "3"
-            else:  # high
-                return "0"
-        elif format == 'ogg':
-            if quality == 'low':
-                return "3"
-            elif quality == 'medium':
-                return "6"
-            else:  # high
-                return "10"
-        else:
-            return "5"  # Default quality parameter
+    def _get_wav_subtype(self, quality: str) -> str:
+        """Get the WAV sample format for a quality setting"""
+        # Set bit depth based on quality; 24-bit PCM is already far below
+        # audibility and, unlike float WAV, plays in browsers
+        if quality == 'low':
+            return 'PCM_16'  # 16-bit
+        elif quality == 'master':
+            return 'FLOAT'   # 32-bit float, for further processing
+        else:  # medium, high
+            return 'PCM_24'  # 24-bit
+    
+    def _get_flac_settings(self, quality: str) -> Tuple[str, Optional[float]]:
+        """Get the FLAC sample format and compression level for a quality setting"""
+        if quality == 'low':
+            return 'PCM_16', None
+        elif quality == 'medium':
+            return 'PCM_24', None  # libsndfile's default compression
+        else:  # high
+            return 'PCM_24', 1.0   # Best compression
+    
+    def _get_bitrate(self, format: str, quality: str) -> Optional[str]:
+        """Get appropriate bitrate for format and quality, or None for VBR formats"""
+        # Unknown qualities get the high setting
+        return self._BITRATES.get((format, quality), self._BITRATES.get((format, 'high')))
+    
+    def _get_quality_parameter(self, format: str, quality: str) -> Optional[str]:
+        """Get format-specific VBR quality parameter, or None for CBR formats"""
+        return self._QUALITY_PARAMETERS.get((format, quality),
+                                            self._QUALITY_PARAMETERS.get((format, 'high')))
 
 # Create singleton instance with processed directory
 audio_exporter = AudioExporter(Path("processed"))
\ No newline at end of file
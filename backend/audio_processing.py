@@ -3,23 +3,277 @@ Advanced Audio Processing Module for AudioChat
 
 This module provides sophisticated audio processing capabilities for the AudioChat application.
 It includes functions for various audio effects, analysis, and processing chains.
+Effects in a processing chain run on float32 buffers end to end.
 """
 
+import os
+import shutil
+import hashlib
 import numpy as np
 import librosa
 import soundfile as sf
 from scipy import signal
+from scipy import fft as sp_fft
 import logging
 from pathlib import Path
 import json
 import re
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
+import _fallback_dsp as fallback_dsp
 
 # Initialize logging
 logger = logging.getLogger(__name__)
 
+try:
+    # Import pyahocorasick for single-pass keyword matching
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    # Import pyrubberband for native pitch shifting and time stretching;
+    # it drives the rubberband command-line tool, which must be installed
+    import pyrubberband
+    PYRUBBERBAND_AVAILABLE = shutil.which('rubberband') is not None
+except ImportError:
+    PYRUBBERBAND_AVAILABLE = False
+
+# Number of synthesized reverb impulse responses kept per processor
+_REVERB_IR_CACHE_SIZE = 16
+
+# Number of noise-reduction noise profiles kept per processor
+_NOISE_PROFILE_CACHE_SIZE = 8
+
+# Smallest block, in samples, that reverb convolution processes at a time
+_REVERB_BLOCK_SIZE = 8192
+
+# Scale from 16-bit PCM to float samples in [-1, 1)
+_INT16_SCALE = np.float32(1 / 32768)
+
+# Samples per chunk for the IIR filters; 128 KiB of float32 stays in L2
+_FILTER_CHUNK_SIZE = 32768
+
+# STFT layout for noise reduction (librosa defaults) and how many frames,
+# about 2^17 samples, are transformed at a time
+_DENOISE_N_FFT = 2048
+_DENOISE_HOP = 512
+_DENOISE_BLOCK_FRAMES = 256
+
+# Every keyword parse_instructions looks for; matched as substrings of the
+# lower-cased instructions
+_INSTRUCTION_KEYWORDS = frozenset({
+    "ambience", "analog", "background", "bandpass", "bass", "boost",
+    "booth", "cathedral", "chipmunk", "clean", "compress", "compression",
+    "cut", "deeper", "delay", "distort", "distortion", "down", "dynamics",
+    "echo", "eq", "equalization", "equalizer", "fast", "faster", "filter",
+    "frequencies", "frequency", "gain", "gentle", "hall", "heavy", "high",
+    "high pass", "higher", "highpass", "hiss", "hum", "increase", "large",
+    "less", "light", "limit", "long", "louder", "low pass", "lower",
+    "lowpass", "maximize", "mid", "mono", "more", "narrow", "narrower",
+    "noise", "pitch", "punchy", "quieter", "radio", "reduce", "repeat",
+    "reverb", "room", "saturate", "saturation", "short", "slow",
+    "slow down", "slower", "small", "softer", "space", "speed", "speed up",
+    "stereo", "strong", "subtle", "telephone", "tempo", "tight", "tone",
+    "treble", "up", "volume", "warm", "wet", "wide", "wider", "width"
+})
+
+_SEMITONE_RE = re.compile(r'(\d+)\s*semitone')
+_PERCENT_RE = re.compile(r'(\d+)%\s*(faster|slower)')
+
+
+def _one_pole(x, samples):
+    """
+    Smooth x along its last axis with y[i] = y[i-1] + (x[i] - y[i-1]) / samples,
+    starting from y[0] = x[0]
+    """
+    k = 1.0 / samples
+    zi = (1.0 - k) * x[..., :1]
+    smoothed, _ = signal.lfilter([k], [1.0, k - 1.0], x, zi=zi)
+    return smoothed.astype(x.dtype, copy=False)
+
+
+def _peak_normalize(x, ceiling=0.99):
+    """Scale x in place so that its absolute peak does not exceed ceiling"""
+    peak = max(x.max(), -x.min())
+    if peak > ceiling:
+        x *= ceiling / peak
+    return x
+
+
+def _partitioned_convolve(audio, ir_spectrum, nfft, ir_length):
+    """
+    Convolve 1-D audio with an impulse response by FFT overlap-add
+    
+    Args:
+        audio: 1-D audio samples
+        ir_spectrum: rfft of the impulse response at size nfft
+        nfft: FFT size; each block covers nfft - ir_length + 1 samples
+        ir_length: Impulse response length in samples
+        
+    Returns:
+        The convolution truncated to len(audio)
+    """
+    length = len(audio)
+    block = nfft - ir_length + 1
+    output = np.zeros(length, dtype=np.result_type(audio.dtype, np.float32))
+    for start in range(0, length, block):
+        segment = sp_fft.irfft(sp_fft.rfft(audio[start:start + block], nfft) * ir_spectrum, nfft)
+        stop = min(start + nfft, length)
+        output[start:stop] += segment[:stop - start]
+    return output
+
+
+def _sosfilt_into(sos, channel, out):
+    """Run an SOS cascade over 1-D audio in cache-sized chunks, carrying its state, into out"""
+    zi = np.zeros((len(sos), 2), dtype=out.dtype)
+    for start in range(0, len(channel), _FILTER_CHUNK_SIZE):
+        stop = start + _FILTER_CHUNK_SIZE
+        out[start:stop], zi = signal.sosfilt(sos, channel[start:stop], zi=zi)
+    return out
+
+
+def _stft_blocks(padded, n_frames):
+    """
+    Yield (first_frame, stft) for consecutive blocks of STFT frames of a
+    centre-padded signal; together the blocks equal librosa.stft(center=True)
+    """
+    for start in range(0, n_frames, _DENOISE_BLOCK_FRAMES):
+        stop = min(start + _DENOISE_BLOCK_FRAMES, n_frames)
+        segment = padded[..., start * _DENOISE_HOP:(stop - 1) * _DENOISE_HOP + _DENOISE_N_FFT]
+        yield start, librosa.stft(segment, n_fft=_DENOISE_N_FFT, hop_length=_DENOISE_HOP,
+                                  center=False)
+
+
+def _overlap_add(y, frames, first_frame):
+    """
+    Add windowed frames of shape (..., n_fft, frames) into y starting at
+    first_frame; frames n_fft / hop apart do not overlap, so each of those
+    interleaved sets is added as one contiguous run
+    """
+    ratio = _DENOISE_N_FFT // _DENOISE_HOP
+    for phase in range(min(ratio, frames.shape[-1])):
+        run = np.swapaxes(frames[..., phase::ratio], -1, -2)
+        run = run.reshape(run.shape[:-2] + (-1,))
+        start = (first_frame + phase) * _DENOISE_HOP
+        y[..., start:start + run.shape[-1]] += run
+
+
+def _to_int16(audio, owned=False):
+    """
+    Clip float audio to [-1, 1] and convert it to 16-bit PCM
+    
+    Args:
+        audio: Float audio samples
+        owned: Whether audio may be overwritten while converting
+        
+    Returns:
+        int16 samples scaled by 32767
+    """
+    scaled = np.clip(audio, -1.0, 1.0, out=audio if owned else None)
+    scaled *= 32767
+    return scaled.astype(np.int16)
+
+
+def _output_buffer(audio_data, out=None):
+    """Copy audio_data into out, or into a new C-contiguous float32 array when out is None"""
+    if out is None:
+        return np.array(audio_data, dtype=np.float32, order='C')
+    out[...] = audio_data
+    return out
+
+
+# Effects that accept an out= buffer for their result
+_OUT_EFFECTS = frozenset({"eq", "compression", "reverb", "delay", "limiter", "distortion",
+                          "filter", "gate"})
+
+
+# EQ bands as (low, high) edges in Hz; "low" and "high" are shelves at the
+# inner edge, the others peaking filters centred between their edges
+_EQ_BANDS = {
+    "low": (20, 250),
+    "low_mid": (250, 1000),
+    "mid": (500, 2000),
+    "high_mid": (1000, 5000),
+    "high": (5000, 20000)
+}
+
+
+@lru_cache(maxsize=128)
+def _eq_section(band, gain_db, sample_rate):
+    """
+    Design the second-order section for one EQ band
+    
+    Args:
+        band: Band name from _EQ_BANDS
+        gain_db: Band gain in dB
+        sample_rate: Sample rate in Hz
+        
+    Returns:
+        SOS row (b0, b1, b2, 1, a1, a2)
+    """
+    low_freq, high_freq = _EQ_BANDS[band]
+    if band == "low":
+        coeffs = fallback_dsp.design_biquad('low_shelf', high_freq, sample_rate, gain_db)
+    elif band == "high":
+        coeffs = fallback_dsp.design_biquad('high_shelf', low_freq, sample_rate, gain_db)
+    else:
+        centre = np.sqrt(low_freq * high_freq)
+        coeffs = fallback_dsp.design_biquad('peak', centre, sample_rate, gain_db,
+                                            q=centre / (high_freq - low_freq))
+    b0, b1, b2, a1, a2 = coeffs
+    return (b0, b1, b2, 1.0, a1, a2)
+
+
+@lru_cache(maxsize=128)
+def _design_butter(order, cutoff, btype, sample_rate):
+    """
+    Design a Butterworth filter, memoized across calls
+    
+    Args:
+        order: Filter order
+        cutoff: Cutoff in Hz, or a (low, high) tuple for band filters
+        btype: 'lowpass', 'highpass' or 'bandpass'
+        sample_rate: Sample rate in Hz
+        
+    Returns:
+        numpy.ndarray: Second-order sections; treat as read-only
+    """
+    return signal.butter(order, cutoff, btype=btype, fs=sample_rate, output='sos')
+
+
+def _warm_kernels():
+    """Run the per-sample Numba kernels once on a short buffer so the first request skips compilation"""
+    dummy = np.zeros((1, 64), dtype=np.float32)
+    fallback_dsp.limiter(dummy, 1.0, 1)
+    fallback_dsp.gate(dummy, 1.0, 10, 1, 1)
+    fallback_dsp.stereo_width(np.zeros((2, 64), dtype=np.float32), 1.0, 0.0)
+
+
+if fallback_dsp.NUMBA_AVAILABLE:
+    _warm_kernels()
+
+
 class AudioProcessor:
     """Main audio processing class that handles all audio manipulation"""
     
+    # Trigger words for each effect in parse_instructions
+    _EQ_KEYWORDS = frozenset({"eq", "equalization", "equalizer", "bass", "treble",
+                              "mid", "frequency", "frequencies", "tone"})
+    _COMPRESSION_KEYWORDS = frozenset({"compress", "compression", "dynamics", "punchy", "tight"})
+    _REVERB_KEYWORDS = frozenset({"reverb", "echo", "space", "room", "hall", "ambience"})
+    _NOISE_KEYWORDS = frozenset({"noise", "clean", "background", "hiss", "hum"})
+    _DELAY_KEYWORDS = frozenset({"delay", "echo", "repeat"})
+    _PITCH_KEYWORDS = frozenset({"pitch", "higher", "lower", "deeper", "chipmunk"})
+    _TIME_STRETCH_KEYWORDS = frozenset({"faster", "slower", "speed", "tempo"})
+    _WIDTH_KEYWORDS = frozenset({"stereo", "width", "wide", "narrow", "mono"})
+    _LIMITER_KEYWORDS = frozenset({"louder", "maximize", "limit", "volume", "gain"})
+    _DISTORTION_KEYWORDS = frozenset({"distort", "distortion", "saturate", "saturation",
+                                      "warm", "analog"})
+    _FILTER_KEYWORDS = frozenset({"filter", "lowpass", "highpass", "bandpass", "telephone", "radio"})
+    
     def __init__(self):
         """Initialize the audio processor"""
         self.supported_effects = {
@@ -47,46 +301,90 @@ class AudioProcessor:
             "vocal_presence": {"low": -1, "low_mid": -2, "high_mid": 4, "high": 2}
         }
         
-    def analyze_audio(self, audio_data, sample_rate):
+        # Instruction keywords plus preset names, and an automaton over them
+        # so one scan finds every hit
+        self._keywords = _INSTRUCTION_KEYWORDS | frozenset(self.eq_presets)
+        self._keyword_automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._keyword_automaton = ahocorasick.Automaton()
+            for word in self._keywords:
+                self._keyword_automaton.add_word(word, word)
+            self._keyword_automaton.make_automaton()
+        
+        # Reverb impulse responses keyed by (room_size, damping, sample_rate),
+        # kept in least-recently-used order for eviction
+        self._reverb_irs = {}
+        
+        # Noise-reduction noise profiles keyed by (audio digest, shape, dtype,
+        # sample_rate, sensitivity), in the same least-recently-used order
+        self._noise_profiles = {}
+        
+        # Threads for per-channel filtering and independent analysis features;
+        # the SciPy and librosa primitives they run release the GIL
+        self._thread_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                               thread_name_prefix='audio-processing')
+        
+    def analyze_audio(self, audio_data, sample_rate, include_beats=False):
         """
         Analyze audio to extract key features
         
         Args:
             audio_data: numpy array of audio samples
             sample_rate: sample rate of the audio
+            include_beats: Also run beat tracking and report "beat_times" in seconds
             
         Returns:
             dict: Analysis results including loudness, spectral features, etc.
         """
         try:
-            # Convert to mono if stereo
+            # Convert to mono if stereo, accumulating in float32
             if len(audio_data.shape) > 1:
-                audio_mono = np.mean(audio_data, axis=0)
+                audio_mono = np.mean(audio_data, axis=0, dtype=np.float32)
+                if audio_data.dtype == np.int16:
+                    audio_mono *= _INT16_SCALE
+            elif audio_data.dtype == np.int16:
+                audio_mono = audio_data * _INT16_SCALE
             else:
-                audio_mono = audio_data
+                audio_mono = np.asarray(audio_data, dtype=np.float32)
                 
             # Calculate RMS (rough loudness estimate)
             rms = np.sqrt(np.mean(audio_mono**2))
             
             # Calculate peak level
-            peak = np.max(np.abs(audio_mono))
+            abs_mono = np.abs(audio_mono)
+            peak = abs_mono.max()
             
             # Calculate crest factor (peak to RMS ratio)
             crest_factor = peak / (rms + 1e-10)  # Avoid division by zero
             
-            # Spectral centroid (brightness)
-            spectral_centroid = np.mean(librosa.feature.spectral_centroid(
-                y=audio_mono, sr=sample_rate)[0])
+            # One STFT shared by all spectral features
+            magnitude = np.abs(librosa.stft(audio_mono, n_fft=2048, hop_length=512))
+            power = magnitude ** 2
+            
+            # Chroma is independent of the other features; compute it alongside them
+            chroma_future = self._thread_pool.submit(librosa.feature.chroma_stft, S=power, sr=sample_rate)
+            
+            # Spectral centroid (brightness), computed directly on the shared
+            # magnitude instead of through librosa's feature wrappers
+            freqs = np.fft.rfftfreq(2048, 1 / sample_rate)
+            frame_sums = magnitude.sum(axis=0)
+            centroids = freqs @ magnitude / np.where(frame_sums > 0, frame_sums, 1)
+            spectral_centroid = np.mean(centroids)
                 
-            # Spectral rolloff (indication of high frequency content)
-            rolloff = np.mean(librosa.feature.spectral_rolloff(
-                y=audio_mono, sr=sample_rate)[0])
+            # Spectral rolloff (indication of high frequency content): the lowest
+            # frequency below which 85% of each frame's magnitude lies
+            cumulative = np.cumsum(magnitude, axis=0)
+            rolloff_bins = np.argmax(cumulative >= 0.85 * cumulative[-1], axis=0)
+            rolloff = np.mean(freqs[rolloff_bins])
                 
-            # Estimate tempo
-            tempo, _ = librosa.beat.beat_track(y=audio_mono, sr=sample_rate)
+            # Estimate tempo from the onset envelope of the log-mel spectrogram
+            onset_env = librosa.onset.onset_strength(
+                S=librosa.power_to_db(librosa.feature.melspectrogram(S=power, sr=sample_rate)),
+                sr=sample_rate)
+            tempo = librosa.feature.tempo(onset_envelope=onset_env, sr=sample_rate)[0]
             
             # Detect key (this is a simplified approach)
-            chroma = librosa.feature.chroma_stft(y=audio_mono, sr=sample_rate)
+            chroma = chroma_future.result()
             key_index = np.argmax(np.mean(chroma, axis=1))
             keys = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
             estimated_key = keys[key_index]
@@ -97,10 +395,17 @@ class AudioProcessor:
             # Check for very low level
             is_too_quiet = peak < 0.1
             
-            # Noise floor estimation (simplified)
-            noise_floor = np.percentile(np.abs(audio_mono), 5)
-            
-            return {
+            # Noise floor estimation (simplified): the 5th percentile of the
+            # absolute level, selected in O(n) instead of sorting
+            position = 0.05 * (abs_mono.size - 1)
+            lower = int(position)
+            abs_mono.partition(lower)
+            noise_floor = abs_mono[lower]
+            if lower + 1 < abs_mono.size:
+                # Interpolate towards the next order statistic like np.percentile
+                noise_floor += (abs_mono[lower + 1:].min() - noise_floor) * (position - lower)
+            
+            analysis = {
                 "rms_level": float(rms),
                 "peak_level": float(peak),
                 "crest_factor": float(crest_factor),
@@ -113,12 +418,34 @@ class AudioProcessor:
                 "noise_floor": float(noise_floor)
             }
             
+            if include_beats:
+                # Beat tracking is a dynamic program over the onset envelope; reuse the tempo
+                _, beat_times = librosa.beat.beat_track(onset_envelope=onset_env, sr=sample_rate,
+                                                        bpm=tempo, units='time')
+                analysis["beat_times"] = beat_times.tolist()
+            
+            return analysis
+            
         except Exception as e:
             logger.error(f"Error analyzing audio: {str(e)}")
             return {
                 "error": str(e)
             }
     
+    def _find_keywords(self, instructions):
+        """
+        Find which instruction keywords occur in a lower-cased request
+        
+        Args:
+            instructions: Lower-cased instruction string
+            
+        Returns:
+            set: Keywords and EQ preset names found as substrings
+        """
+        if self._keyword_automaton is not None:
+            return {word for _, word in self._keyword_automaton.iter(instructions)}
+        return {word for word in self._keywords if word in instructions}
+    
     def parse_instructions(self, instructions, audio_analysis=None):
         """
         Parse natural language instructions to determine processing chain
@@ -131,38 +458,37 @@ class AudioProcessor:
             list: Processing chain with effects and parameters
         """
         instructions = instructions.lower()
+        hits = self._find_keywords(instructions)
         processing_chain = []
         
         # Check for EQ-related instructions
-        if any(word in instructions for word in ["eq", "equalization", "equalizer", "bass", "treble", 
-                                               "mid", "frequency", "frequencies", "tone"]):
+        if self._EQ_KEYWORDS & hits:
             eq_params = {}
             
-            # Check for EQ presets first
-            for preset_name in self.eq_presets:
-                if preset_name in instructions:
-                    eq_params = self.eq_presets[preset_name].copy()
-                    break
+            # Check for EQ presets first; the earliest-defined preset wins
+            preset_name = next((name for name in self.eq_presets if name in hits), None)
+            if preset_name is not None:
+                eq_params = self.eq_presets[preset_name].copy()
             
             # Check for specific frequency adjustments
-            if "bass" in instructions:
-                if "more" in instructions or "boost" in instructions or "increase" in instructions:
+            if "bass" in hits:
+                if "more" in hits or "boost" in hits or "increase" in hits:
                     eq_params["low"] = 4
-                elif "less" in instructions or "cut" in instructions or "reduce" in instructions:
+                elif "less" in hits or "cut" in hits or "reduce" in hits:
                     eq_params["low"] = -4
                 else:
                     eq_params["low"] = 2
                     
-            if "mid" in instructions:
-                if "more" in instructions or "boost" in instructions or "increase" in instructions:
+            if "mid" in hits:
+                if "more" in hits or "boost" in hits or "increase" in hits:
                     eq_params["mid"] = 3
-                elif "less" in instructions or "cut" in instructions or "reduce" in instructions:
+                elif "less" in hits or "cut" in hits or "reduce" in hits:
                     eq_params["mid"] = -3
                     
-            if "treble" in instructions or "high" in instructions:
-                if "more" in instructions or "boost" in instructions or "increase" in instructions:
+            if "treble" in hits or "high" in hits:
+                if "more" in hits or "boost" in hits or "increase" in hits:
                     eq_params["high"] = 3
-                elif "less" in instructions or "cut" in instructions or "reduce" in instructions:
+                elif "less" in hits or "cut" in hits or "reduce" in hits:
                     eq_params["high"] = -3
             
             # Add EQ to processing chain if parameters were set
@@ -173,7 +499,7 @@ class AudioProcessor:
                 })
         
         # Check for compression-related instructions
-        if any(word in instructions for word in ["compress", "compression", "dynamics", "punchy", "tight"]):
+        if self._COMPRESSION_KEYWORDS & hits:
             comp_params = {
                 "threshold": -20,
                 "ratio": 3,
@@ -182,17 +508,17 @@ class AudioProcessor:
             }
             
             # Adjust parameters based on instructions
-            if "heavy" in instructions or "strong" in instructions:
+            if "heavy" in hits or "strong" in hits:
                 comp_params["ratio"] = 6
                 comp_params["threshold"] = -24
-            elif "light" in instructions or "gentle" in instructions or "subtle" in instructions:
+            elif "light" in hits or "gentle" in hits or "subtle" in hits:
                 comp_params["ratio"] = 2
                 comp_params["threshold"] = -18
                 
-            if "fast" in instructions:
+            if "fast" in hits:
                 comp_params["attack"] = 5
                 comp_params["release"] = 100
-            elif "slow" in instructions:
+            elif "slow" in hits:
                 comp_params["attack"] = 50
                 comp_params["release"] = 500
                 
@@ -202,7 +528,7 @@ class AudioProcessor:
             })
         
         # Check for reverb-related instructions
-        if any(word in instructions for word in ["reverb", "echo", "space", "room", "hall", "ambience"]):
+        if self._REVERB_KEYWORDS & hits:
             reverb_params = {
                 "room_size": 0.5,
                 "damping": 0.5,
@@ -211,17 +537,17 @@ class AudioProcessor:
             }
             
             # Adjust parameters based on instructions
-            if "large" in instructions or "hall" in instructions or "cathedral" in instructions:
+            if "large" in hits or "hall" in hits or "cathedral" in hits:
                 reverb_params["room_size"] = 0.85
                 reverb_params["wet_level"] = 0.4
-            elif "small" in instructions or "room" in instructions or "booth" in instructions:
+            elif "small" in hits or "room" in hits or "booth" in hits:
                 reverb_params["room_size"] = 0.3
                 reverb_params["wet_level"] = 0.25
                 
-            if "more" in instructions or "wet" in instructions:
+            if "more" in hits or "wet" in hits:
                 reverb_params["wet_level"] += 0.15
                 reverb_params["dry_level"] -= 0.15
-            elif "less" in instructions or "subtle" in instructions or "gentle" in instructions:
+            elif "less" in hits or "subtle" in hits or "gentle" in hits:
                 reverb_params["wet_level"] -= 0.1
                 reverb_params["dry_level"] += 0.1
                 
@@ -231,15 +557,15 @@ class AudioProcessor:
             })
         
         # Check for noise reduction
-        if any(word in instructions for word in ["noise", "clean", "background", "hiss", "hum"]):
+        if self._NOISE_KEYWORDS & hits:
             noise_params = {
                 "strength": 0.5,
                 "sensitivity": 0.5
             }
             
-            if "strong" in instructions or "heavy" in instructions:
+            if "strong" in hits or "heavy" in hits:
                 noise_params["strength"] = 0.8
-            elif "light" in instructions or "gentle" in instructions:
+            elif "light" in hits or "gentle" in hits:
                 noise_params["strength"] = 0.3
                 
             processing_chain.append({
@@ -248,23 +574,23 @@ class AudioProcessor:
             })
         
         # Check for delay/echo effect
-        if any(word in instructions for word in ["delay", "echo", "repeat"]) and "echo" not in str(processing_chain):
+        if self._DELAY_KEYWORDS & hits and "echo" not in str(processing_chain):
             delay_params = {
                 "time": 0.25,  # 250ms delay
                 "feedback": 0.3,
                 "mix": 0.3
             }
             
-            if "long" in instructions:
+            if "long" in hits:
                 delay_params["time"] = 0.5
                 delay_params["feedback"] = 0.4
-            elif "short" in instructions:
+            elif "short" in hits:
                 delay_params["time"] = 0.125
                 delay_params["feedback"] = 0.2
                 
-            if "more" in instructions:
+            if "more" in hits:
                 delay_params["mix"] = 0.5
-            elif "subtle" in instructions or "less" in instructions:
+            elif "subtle" in hits or "less" in hits:
                 delay_params["mix"] = 0.2
                 
             processing_chain.append({
@@ -273,23 +599,23 @@ class AudioProcessor:
             })
         
         # Check for pitch shifting
-        if any(word in instructions for word in ["pitch", "higher", "lower", "deeper", "chipmunk"]):
+        if self._PITCH_KEYWORDS & hits:
             pitch_params = {
                 "semitones": 0
             }
             
-            if "higher" in instructions or "up" in instructions:
+            if "higher" in hits or "up" in hits:
                 pitch_params["semitones"] = 2
-            elif "lower" in instructions or "down" in instructions or "deeper" in instructions:
+            elif "lower" in hits or "down" in hits or "deeper" in hits:
                 pitch_params["semitones"] = -2
-            elif "chipmunk" in instructions:
+            elif "chipmunk" in hits:
                 pitch_params["semitones"] = 6
                 
             # Look for specific semitone values
-            semitone_match = re.search(r'(\d+)\s*semitone', instructions)
+            semitone_match = _SEMITONE_RE.search(instructions)
             if semitone_match:
                 semitones = int(semitone_match.group(1))
-                if "down" in instructions or "lower" in instructions:
+                if "down" in hits or "lower" in hits:
                     semitones = -semitones
                 pitch_params["semitones"] = semitones
                 
@@ -299,18 +625,18 @@ class AudioProcessor:
             })
         
         # Check for time stretching
-        if any(word in instructions for word in ["faster", "slower", "speed", "tempo"]):
+        if self._TIME_STRETCH_KEYWORDS & hits:
             time_params = {
                 "rate": 1.0
             }
             
-            if "faster" in instructions or "speed up" in instructions:
+            if "faster" in hits or "speed up" in hits:
                 time_params["rate"] = 1.2
-            elif "slower" in instructions or "slow down" in instructions:
+            elif "slower" in hits or "slow down" in hits:
                 time_params["rate"] = 0.8
                 
             # Look for specific percentage values
-            percent_match = re.search(r'(\d+)%\s*(faster|slower)', instructions)
+            percent_match = _PERCENT_RE.search(instructions)
             if percent_match:
                 percent = int(percent_match.group(1)) / 100
                 if "faster" in percent_match.group(2):
@@ -324,16 +650,16 @@ class AudioProcessor:
             })
         
         # Check for stereo width adjustments
-        if any(word in instructions for word in ["stereo", "width", "wide", "narrow", "mono"]):
+        if self._WIDTH_KEYWORDS & hits:
             width_params = {
                 "width": 1.0  # 1.0 is normal stereo
             }
             
-            if "wider" in instructions or "more" in instructions:
+            if "wider" in hits or "more" in hits:
                 width_params["width"] = 1.5
-            elif "narrower" in instructions or "less" in instructions:
+            elif "narrower" in hits or "less" in hits:
                 width_params["width"] = 0.7
-            elif "mono" in instructions:
+            elif "mono" in hits:
                 width_params["width"] = 0.0
                 
             processing_chain.append({
@@ -342,16 +668,16 @@ class AudioProcessor:
             })
         
         # Check for limiting/maximizing
-        if any(word in instructions for word in ["louder", "maximize", "limit", "volume", "gain"]):
+        if self._LIMITER_KEYWORDS & hits:
             limiter_params = {
                 "gain": 0,
                 "threshold": -0.3,
                 "release": 50
             }
             
-            if "louder" in instructions or "maximize" in instructions:
+            if "louder" in hits or "maximize" in hits:
                 limiter_params["gain"] = 6
-            elif "quieter" in instructions or "softer" in instructions:
+            elif "quieter" in hits or "softer" in hits:
                 limiter_params["gain"] = -6
                 
             processing_chain.append({
@@ -360,16 +686,16 @@ class AudioProcessor:
             })
         
         # Check for distortion/saturation
-        if any(word in instructions for word in ["distort", "distortion", "saturate", "saturation", "warm", "analog"]):
+        if self._DISTORTION_KEYWORDS & hits:
             dist_params = {
                 "drive": 2.0,
                 "mix": 0.5
             }
             
-            if "heavy" in instructions or "more" in instructions:
+            if "heavy" in hits or "more" in hits:
                 dist_params["drive"] = 5.0
                 dist_params["mix"] = 0.7
-            elif "subtle" in instructions or "light" in instructions or "warm" in instructions:
+            elif "subtle" in hits or "light" in hits or "warm" in hits:
                 dist_params["drive"] = 1.5
                 dist_params["mix"] = 0.3
                 
@@ -379,7 +705,7 @@ class AudioProcessor:
             })
         
         # Check for filter effects
-        if any(word in instructions for word in ["filter", "lowpass", "highpass", "bandpass", "telephone", "radio"]):
+        if self._FILTER_KEYWORDS & hits:
             filter_params = {
                 "type": "bandpass",
                 "cutoff_low": 500,
@@ -387,16 +713,16 @@ class AudioProcessor:
                 "resonance": 0.7
             }
             
-            if "lowpass" in instructions or "low pass" in instructions:
+            if "lowpass" in hits or "low pass" in hits:
                 filter_params["type"] = "lowpass"
                 filter_params["cutoff_high"] = 1000
-            elif "highpass" in instructions or "high pass" in instructions:
+            elif "highpass" in hits or "high pass" in hits:
                 filter_params["type"] = "highpass"
                 filter_params["cutoff_low"] = 1000
-            elif "telephone" in instructions:
+            elif "telephone" in hits:
                 filter_params["cutoff_low"] = 800
                 filter_params["cutoff_high"] = 3000
-            elif "radio" in instructions:
+            elif "radio" in hits:
                 filter_params["cutoff_low"] = 500
                 filter_params["cutoff_high"] = 5000
                 
@@ -433,13 +759,15 @@ class AudioProcessor:
         Process audio based on natural language instructions or explicit effects chain
         
         Args:
-            audio_data: numpy array of audio samples
+            audio_data: numpy array of audio samples; int16 samples are
+                read as 16-bit PCM
             sample_rate: sample rate of the audio
             instructions: String containing user's processing request
             effects: Optional list of effects to apply
             
         Returns:
-            tuple: (processed_audio, processing_steps)
+            tuple: (processed_audio, processing_steps); processed_audio is
+            int16 for int16 input and float32 otherwise
         """
         try:
             # Analyze audio
@@ -451,21 +779,42 @@ class AudioProcessor:
             else:
                 processing_chain = effects
                 
-            # Apply processing chain
-            processed_audio = audio_data.copy()
+            # Apply processing chain; effects run in float32 end to end, and
+            # int16 audio is only widened here and narrowed again at the end
+            if audio_data.dtype == np.int16:
+                processed_audio = np.multiply(audio_data, _INT16_SCALE, order='C')
+            else:
+                processed_audio = np.ascontiguousarray(audio_data, dtype=np.float32)
             processing_steps = []
             
+            # Scratch buffer that effects able to write into out= ping-pong with
+            spare = None
+            
             for effect in processing_chain:
                 effect_type = effect["type"]
                 parameters = effect["parameters"]
                 
                 if effect_type in self.supported_effects:
                     # Apply the effect
-                    processed_audio = self.supported_effects[effect_type](processed_audio, sample_rate, parameters)
+                    apply = self.supported_effects[effect_type]
+                    if effect_type in _OUT_EFFECTS:
+                        if spare is None or spare.shape != processed_audio.shape or spare.dtype != processed_audio.dtype:
+                            spare = np.empty_like(processed_audio)
+                        result = apply(processed_audio, sample_rate, parameters, out=spare)
+                    else:
+                        result = apply(processed_audio, sample_rate, parameters)
+                    
+                    if result is spare:
+                        # The previous buffer becomes scratch unless it is the caller's audio
+                        spare = None if np.shares_memory(processed_audio, audio_data) else processed_audio
+                    processed_audio = result
                     
                     # Add to processing steps
                     step_description = self.describe_effect(effect_type, parameters)
                     processing_steps.append(step_description)
+            
+            if audio_data.dtype == np.int16:
+                processed_audio = _to_int16(processed_audio, owned=not np.shares_memory(processed_audio, audio_data))
                     
             return processed_audio, processing_steps
             
@@ -473,6 +822,26 @@ class AudioProcessor:
             logger.error(f"Error processing audio: {str(e)}")
             return audio_data, [f"Error: {str(e)}"]
     
+    def _per_channel(self, func, audio_data, out=None):
+        """
+        Apply a channel-independent function to every channel on the thread pool
+        
+        Args:
+            func: Function mapping one 1-D channel to a 1-D result, or when out
+                is given, writing one channel into the matching row of out
+            audio_data: 1-D audio, or planar (channels, samples) audio
+            out: Optional buffer shaped like audio_data for the result
+            
+        Returns:
+            out when given, otherwise func's result stacked back into planar
+            layout for multichannel input
+        """
+        args = (audio_data,) if out is None else (audio_data, out)
+        if audio_data.ndim < 2 or audio_data.shape[0] < 2:
+            return func(*args)
+        results = list(self._thread_pool.map(func, *args))
+        return out if out is not None else np.stack(results)
+    
     def describe_effect(self, effect_type, parameters):
         """Generate a human-readable description of an effect"""
         if effect_type == "eq":
@@ -549,54 +918,24 @@ class AudioProcessor:
             return f"Applied {effect_type}"
     
     # Effect implementation methods
-    def apply_eq(self, audio_data, sample_rate, parameters):
-        """Apply equalization to audio data"""
+    def apply_eq(self, audio_data, sample_rate, parameters, out=None):
+        """Apply equalization to audio data, writing into out when given"""
         try:
-            # Create a copy of the audio data
-            processed_audio = audio_data.copy()
-            
-            # Define frequency bands
-            bands = {
-                "low": (20, 250),
-                "low_mid": (250, 1000),
-                "mid": (500, 2000),
-                "high_mid": (1000, 5000),
-                "high": (5000, 20000)
-            }
-            
-            # Apply EQ for each band
-            for band, value in parameters.items():
-                if band in bands and value != 0:
-                    # Get band frequency range
-                    low_freq, high_freq = bands[band]
-                    
-                    # Convert to linear gain
-                    gain = 10 ** (value / 20)
-                    
-                    # Design bandpass filter for this frequency range
-                    nyquist = sample_rate / 2
-                    low_normalized = low_freq / nyquist
-                    high_normalized = high_freq / nyquist
-                    
-                    # For low band, use low shelf
-                    if band == "low":
-                        b, a = signal.butter(2, high_normalized, btype='lowpass')
-                    # For high band, use high shelf
-                    elif band == "high":
-                        b, a = signal.butter(2, low_normalized, btype='highpass')
-                    # For mid bands, use bandpass
-                    else:
-                        b, a = signal.butter(2, [low_normalized, high_normalized], btype='bandpass')
-                    
-                    # Apply filter to get the band
-                    band_audio = signal.lfilter(b, a, processed_audio)
-                    
-                    # Apply gain to the band and add back to the signal
-                    processed_audio = processed_audio + (band_audio * (gain - 1))
+            # One biquad section per active band, run as a single cascade
+            sections = [_eq_section(band, value, sample_rate)
+                        for band, value in parameters.items()
+                        if band in _EQ_BANDS and value != 0]
+            if sections:
+                if out is None:
+                    out = np.empty(audio_data.shape, dtype=np.result_type(audio_data.dtype, np.float32))
+                sos = np.array(sections, dtype=out.dtype)
+                processed_audio = self._per_channel(
+                    lambda channel, channel_out: _sosfilt_into(sos, channel, channel_out), audio_data, out)
+            else:
+                processed_audio = _output_buffer(audio_data, out)
             
             # Prevent clipping
-            if np.max(np.abs(processed_audio)) > 0.99:
-                processed_audio = processed_audio / np.max(np.abs(processed_audio)) * 0.99
+            _peak_normalize(processed_audio)
                 
             return processed_audio
             
@@ -604,8 +943,8 @@ class AudioProcessor:
             logger.error(f"Error applying EQ: {str(e)}")
             return audio_data
     
-    def apply_compression(self, audio_data, sample_rate, parameters):
-        """Apply dynamic range compression to audio data"""
+    def apply_compression(self, audio_data, sample_rate, parameters, out=None):
+        """Apply dynamic range compression to audio data, writing into out when given"""
         try:
             # Extract parameters
             threshold = parameters.get('threshold', -20)
@@ -622,43 +961,26 @@ class AudioProcessor:
             attack_samples = max(1, attack_samples)
             release_samples = max(1, release_samples)
             
-            # Initialize gain reduction and output arrays
-            gain_reduction = np.ones_like(audio_data)
-            output = np.zeros_like(audio_data)
-            
-            # Apply compression sample by sample
-            for i in range(len(audio_data)):
-                # Calculate instantaneous gain reduction
-                input_level = np.abs(audio_data[i])
-                if input_level > threshold_linear:
-                    target_gain = (input_level / threshold_linear) ** (1/ratio - 1)
-                else:
-                    target_gain = 1.0
-                
-                # Apply attack/release smoothing
-                if target_gain < gain_reduction[i-1] if i > 0 else 1.0:
-                    # Attack phase
-                    if i > 0:
-                        gain_reduction[i] = gain_reduction[i-1] + (target_gain - gain_reduction[i-1]) / attack_samples
-                    else:
-                        gain_reduction[i] = target_gain
-                else:
-                    # Release phase
-                    if i > 0:
-                        gain_reduction[i] = gain_reduction[i-1] + (target_gain - gain_reduction[i-1]) / release_samples
-                    else:
-                        gain_reduction[i] = target_gain
-                
-                # Apply gain reduction
-                output[i] = audio_data[i] * gain_reduction[i]
+            output = _output_buffer(audio_data, out)
+            if fallback_dsp.NUMBA_AVAILABLE:
+                # Run the exact attack/release loop in a compiled kernel on the planar buffer
+                fallback_dsp.compressor(output.reshape(-1, output.shape[-1]), threshold_linear,
+                                        1 / ratio - 1, attack_samples, release_samples)
+            else:
+                # Without Numba approximate the envelope with two one-pole filters in C
+                level = np.abs(output)
+                target_gain = np.ones_like(output)
+                over = level > threshold_linear
+                target_gain[over] = (level[over] / threshold_linear) ** (1 / ratio - 1)
+                output *= np.minimum(_one_pole(target_gain, attack_samples),
+                                     _one_pole(target_gain, release_samples))
             
             # Apply makeup gain to bring level back up
             makeup_gain = 1 / (10 ** (threshold / 20) * (1 - 1/ratio))
-            output = output * makeup_gain
+            output *= makeup_gain
             
             # Prevent clipping
-            if np.max(np.abs(output)) > 0.99:
-                output = output / np.max(np.abs(output)) * 0.99
+            _peak_normalize(output)
                 
             return output
             
@@ -666,8 +988,8 @@ class AudioProcessor:
             logger.error(f"Error applying compression: {str(e)}")
             return audio_data
     
-    def apply_reverb(self, audio_data, sample_rate, parameters):
-        """Apply reverb effect to audio data"""
+    def apply_reverb(self, audio_data, sample_rate, parameters, out=None):
+        """Apply reverb effect to audio data, writing into out when given"""
         try:
             # Extract parameters
             room_size = parameters.get('room_size', 0.5)
@@ -675,23 +997,20 @@ class AudioProcessor:
             wet_level = parameters.get('wet_level', 0.33)
             dry_level = parameters.get('dry_level', 0.7)
             
-            # Calculate reverb time in samples
-            reverb_time = int(room_size * sample_rate * 2)  # Up to 2 seconds for room_size=1.0
+            ir_spectrum, nfft, ir_length = self._get_reverb_ir(room_size, damping, sample_rate)
             
-            # Create impulse response
-            impulse_response = np.zeros(reverb_time)
-            decay = np.linspace(1, 0, reverb_time) ** damping
-            impulse_response = decay * np.random.randn(reverb_time) * 0.5
-            
-            # Apply convolution
-            wet_signal = signal.convolve(audio_data, impulse_response, mode='full')[:len(audio_data)]
+            # Convolve block by block against the cached spectrum of the response
+            audio = np.ascontiguousarray(audio_data, dtype=np.float32)
+            wet_signal = self._per_channel(
+                lambda channel: _partitioned_convolve(channel, ir_spectrum, nfft, ir_length), audio)
             
             # Mix dry and wet signals
-            output = dry_level * audio_data + wet_level * wet_signal
+            output = np.multiply(audio, dry_level, out=out)
+            wet_signal *= wet_level
+            output += wet_signal
             
             # Normalize to prevent clipping
-            if np.max(np.abs(output)) > 0.99:
-                output = output / np.max(np.abs(output)) * 0.99
+            _peak_normalize(output)
                 
             return output
             
@@ -699,6 +1018,85 @@ class AudioProcessor:
             logger.error(f"Error applying reverb: {str(e)}")
             return audio_data
     
+    def _get_reverb_ir(self, room_size, damping, sample_rate):
+        """
+        Get the noise impulse response for a reverb setting as a spectrum for
+        _partitioned_convolve, synthesizing it on first use
+        
+        Args:
+            room_size: Room size between 0 and 1
+            damping: Exponent of the linear decay envelope
+            sample_rate: Sample rate in Hz
+            
+        Returns:
+            tuple: (rfft of the response, FFT size, response length in samples)
+        """
+        # Settings within 0.01 of each other share a response
+        room_size, damping = round(room_size, 2), round(damping, 2)
+        key = (room_size, damping, sample_rate)
+        cached = self._reverb_irs.pop(key, None)
+        if cached is None:
+            # Calculate reverb time in samples
+            reverb_time = int(room_size * sample_rate * 2)  # Up to 2 seconds for room_size=1.0
+            
+            # Create impulse response: float32 noise shaped in place by the decay
+            impulse_response = np.random.default_rng().standard_normal(reverb_time, dtype=np.float32)
+            decay = np.linspace(1, 0, reverb_time, dtype=np.float32)
+            np.power(decay, damping, out=decay)
+            decay *= 0.5
+            impulse_response *= decay
+            
+            # Blocks of at least twice the response keep the FFT overhead per sample low
+            nfft = sp_fft.next_fast_len(max(_REVERB_BLOCK_SIZE, 2 * reverb_time) + reverb_time - 1, real=True)
+            cached = (sp_fft.rfft(impulse_response, nfft), nfft, reverb_time)
+            
+            if len(self._reverb_irs) >= _REVERB_IR_CACHE_SIZE:
+                # Evict the least recently used response
+                del self._reverb_irs[next(iter(self._reverb_irs))]
+        self._reverb_irs[key] = cached
+        return cached
+    
+    def _get_noise_profile(self, audio_data, padded, n_frames, sample_rate, sensitivity):
+        """
+        Get the per-bin noise profile for noise reduction, estimating it on
+        first use for this audio and sensitivity
+        
+        Args:
+            audio_data: Audio being denoised
+            padded: audio_data centre-padded for framing
+            n_frames: Number of STFT frames in padded
+            sample_rate: Sample rate in Hz
+            sensitivity: Percentile of each bin's magnitude taken as noise, in tens of percent
+            
+        Returns:
+            numpy.ndarray: float32 profile of shape (..., bins, 1); treat as read-only
+        """
+        digest = hashlib.blake2b(np.ascontiguousarray(audio_data), digest_size=16).digest()
+        key = (digest, audio_data.shape, audio_data.dtype.str, sample_rate, sensitivity)
+        noise_profile = self._noise_profiles.pop(key, None)
+        if noise_profile is None:
+            # Estimate noise profile from the quietest frames
+            magnitude = np.empty(audio_data.shape[:-1] + (_DENOISE_N_FFT // 2 + 1, n_frames),
+                                 dtype=np.float32)
+            for start, stft in _stft_blocks(padded, n_frames):
+                np.abs(stft, out=magnitude[..., start:start + stft.shape[-1]])
+            
+            # Select each bin's percentile in O(frames) instead of sorting
+            position = sensitivity * 0.1 * (n_frames - 1)
+            lower = int(position)
+            magnitude.partition(lower, axis=-1)
+            noise_profile = magnitude[..., lower:lower + 1].copy()
+            if lower + 1 < n_frames:
+                # Interpolate towards the next order statistic like np.percentile
+                upper = magnitude[..., lower + 1:].min(axis=-1, keepdims=True)
+                noise_profile += (upper - noise_profile) * (position - lower)
+            
+            if len(self._noise_profiles) >= _NOISE_PROFILE_CACHE_SIZE:
+                # Evict the least recently used profile
+                del self._noise_profiles[next(iter(self._noise_profiles))]
+        self._noise_profiles[key] = noise_profile
+        return noise_profile
+    
     def apply_noise_reduction(self, audio_data, sample_rate, parameters):
         """Apply noise reduction to audio data"""
         try:
@@ -709,26 +1107,42 @@ class AudioProcessor:
             # Simple spectral gating noise reduction
             # In a real implementation, we would use a more sophisticated algorithm
             
-            # Convert to frequency domain
-            stft = librosa.stft(audio_data)
-            magnitude = np.abs(stft)
-            phase = np.angle(stft)
-            
-            # Estimate noise profile from the quietest frames
-            noise_profile = np.percentile(magnitude, sensitivity * 10, axis=1)
-            noise_profile = noise_profile.reshape(-1, 1)
-            
-            # Apply spectral gating
-            gain = 1 - (noise_profile / (magnitude + 1e-10))
-            gain = np.maximum(0, gain)
-            gain = gain ** strength
-            
-            # Apply gain to magnitude
-            magnitude_reduced = magnitude * gain
-            
-            # Convert back to time domain
-            stft_reduced = magnitude_reduced * np.exp(1j * phase)
-            output = librosa.istft(stft_reduced, length=len(audio_data))
+            # Frame the signal as librosa.stft(center=True) does, but only
+            # hold one block of frames in the complex domain at a time
+            length = audio_data.shape[-1]
+            padding = [(0, 0)] * (audio_data.ndim - 1) + [(_DENOISE_N_FFT // 2, _DENOISE_N_FFT // 2)]
+            padded = np.pad(audio_data, padding)
+            n_frames = 1 + (padded.shape[-1] - _DENOISE_N_FFT) // _DENOISE_HOP
+            
+            noise_profile = self._get_noise_profile(audio_data, padded, n_frames,
+                                                    sample_rate, sensitivity)
+            
+            # Gate each block and overlap-add it back, as librosa.istft does
+            window = signal.get_window('hann', _DENOISE_N_FFT)[:, np.newaxis]
+            y = np.zeros(audio_data.shape[:-1] + (_DENOISE_N_FFT + _DENOISE_HOP * (n_frames - 1),),
+                         dtype=np.float32)
+            for start, stft in _stft_blocks(padded, n_frames):
+                # Apply spectral gating; the gain is real, so scaling the
+                # complex bins keeps their phase without a polar round trip
+                gain = np.abs(stft)
+                gain += 1e-10
+                np.divide(noise_profile, gain, out=gain)
+                np.subtract(1, gain, out=gain)
+                np.maximum(gain, 0, out=gain)
+                gain **= strength
+                stft *= gain
+                
+                # Convert back to time domain
+                frames = sp_fft.irfft(stft, n=_DENOISE_N_FFT, axis=-2)
+                frames *= window
+                _overlap_add(y, frames, start)
+            
+            window_sum = librosa.filters.window_sumsquare(
+                window='hann', n_frames=n_frames, hop_length=_DENOISE_HOP,
+                n_fft=_DENOISE_N_FFT, dtype=np.float32)
+            nonzero = window_sum > librosa.util.tiny(window_sum)
+            y[..., nonzero] /= window_sum[nonzero]
+            output = y[..., _DENOISE_N_FFT // 2:_DENOISE_N_FFT // 2 + length]
             
             return output
             
@@ -736,8 +1150,8 @@ class AudioProcessor:
             logger.error(f"Error applying noise reduction: {str(e)}")
             return audio_data
     
-    def apply_delay(self, audio_data, sample_rate, parameters):
-        """Apply delay/echo effect to audio data"""
+    def apply_delay(self, audio_data, sample_rate, parameters, out=None):
+        """Apply delay/echo effect to audio data, writing into out when given"""
         try:
             # Extract parameters
             delay_time = parameters.get('time', 0.25)  # in seconds
@@ -747,11 +1161,12 @@ class AudioProcessor:
             # Calculate delay in samples
             delay_samples = int(delay_time * sample_rate)
             
-            # Create output buffer
-            output = audio_data.copy()
+            # Start from the attenuated dry signal
+            output = np.multiply(audio_data, 1 - mix, out=out)
+            length = audio_data.shape[-1]
             
-            # Apply delay with feedback
-            delay_buffer = np.zeros_like(audio_data)
+            # One scratch buffer holds each scaled tap before it is added
+            scratch = np.empty_like(output)
             
             # Simple implementation with limited feedback iterations
             for i in range(1, 6):  # Limit to 5 feedback iterations
@@ -759,19 +1174,17 @@ class AudioProcessor:
                 this_delay = delay_samples * i
                 
                 # Skip if delay is longer than the audio
-                if this_delay >= len(audio_data):
+                if this_delay >= length:
                     break
                 
-                # Apply delay and feedback
+                # Add the delayed tap straight onto the output
                 delay_gain = feedback ** (i - 1)
-                delay_buffer[this_delay:] += audio_data[:len(audio_data)-this_delay] * delay_gain * mix
-            
-            # Mix original and delayed signal
-            output = (1 - mix) * audio_data + delay_buffer
+                tap = np.multiply(audio_data[..., :length - this_delay], delay_gain * mix,
+                                  out=scratch[..., :length - this_delay])
+                output[..., this_delay:] += tap
             
             # Prevent clipping
-            if np.max(np.abs(output)) > 0.99:
-                output = output / np.max(np.abs(output)) * 0.99
+            _peak_normalize(output)
                 
             return output
             
@@ -785,8 +1198,12 @@ class AudioProcessor:
             # Extract parameters
             semitones = parameters.get('semitones', 0)
             
-            # Use librosa's pitch shift
-            output = librosa.effects.pitch_shift(audio_data, sr=sample_rate, n_steps=semitones)
+            if PYRUBBERBAND_AVAILABLE:
+                # Rubber Band takes (samples, channels) and shifts in native code
+                output = pyrubberband.pitch_shift(audio_data.T, sample_rate, semitones).T
+            else:
+                # Use librosa's pitch shift
+                output = librosa.effects.pitch_shift(audio_data, sr=sample_rate, n_steps=semitones)
             
             return output
             
@@ -800,8 +1217,12 @@ class AudioProcessor:
             # Extract parameters
             rate = parameters.get('rate', 1.0)
             
-            # Use librosa's time stretch
-            output = librosa.effects.time_stretch(audio_data, rate=rate)
+            if PYRUBBERBAND_AVAILABLE:
+                # Rubber Band takes (samples, channels) and stretches in native code
+                output = pyrubberband.time_stretch(audio_data.T, sample_rate, rate).T
+            else:
+                # Use librosa's time stretch
+                output = librosa.effects.time_stretch(audio_data, rate=rate)
             
             # If the output is shorter than the input, pad with zeros
             if len(output) < len(audio_data):
@@ -828,23 +1249,23 @@ class AudioProcessor:
                 
             # If stereo, adjust width
             if len(audio_data.shape) == 2 and audio_data.shape[0] == 2:
-                # Convert to mid-side
-                mid = (audio_data[0] + audio_data[1]) / 2
-                side = (audio_data[0] - audio_data[1]) / 2
+                # Scaling side by width in mid/side is the same as mixing
+                # each channel with this much of the other
+                direct = (1 + width) / 2
+                cross = (1 - width) / 2
                 
-                # Adjust side level to change width
-                side = side * width
-                
-                # Convert back to left-right
-                left = mid + side
-                right = mid - side
-                
-                # Combine channels
-                output = np.vstack((left, right))
+                output = _output_buffer(audio_data)
+                if fallback_dsp.NUMBA_AVAILABLE:
+                    fallback_dsp.stereo_width(output, direct, cross)
+                else:
+                    output *= direct
+                    scratch = np.multiply(audio_data[1], cross, dtype=np.float32)
+                    output[0] += scratch
+                    np.multiply(audio_data[0], cross, out=scratch)
+                    output[1] += scratch
                 
                 # Prevent clipping
-                if np.max(np.abs(output)) > 0.99:
-                    output = output / np.max(np.abs(output)) * 0.99
+                _peak_normalize(output)
                     
                 return output
                 
@@ -855,8 +1276,8 @@ class AudioProcessor:
             logger.error(f"Error applying stereo width: {str(e)}")
             return audio_data
     
-    def apply_limiter(self, audio_data, sample_rate, parameters):
-        """Apply limiting and gain to audio data"""
+    def apply_limiter(self, audio_data, sample_rate, parameters, out=None):
+        """Apply limiting and gain to audio data, writing into out when given"""
         try:
             # Extract parameters
             gain_db = parameters.get('gain', 0)
@@ -866,31 +1287,34 @@ class AudioProcessor:
             # Convert to linear values
             gain_linear = 10 ** (gain_db / 20)
             threshold_linear = 10 ** (threshold_db / 20)
-            release_samples = int(release_ms * sample_rate / 1000)
+            release_samples = max(1, int(release_ms * sample_rate / 1000))
             
             # Apply gain
-            output = audio_data * gain_linear
+            output = _output_buffer(audio_data, out)
+            output *= gain_linear
             
-            # Apply limiting
-            gain_reduction = np.ones_like(output)
-            
-            # Calculate gain reduction needed
-            for i in range(len(output)):
-                input_level = np.abs(output[i])
-                if input_level > threshold_linear:
-                    target_gain = threshold_linear / input_level
-                else:
-                    target_gain = 1.0
-                
-                # Apply release smoothing
-                if i > 0:
-                    gain_reduction[i] = min(1.0, gain_reduction[i-1] + (1.0 - gain_reduction[i-1]) / release_samples)
-                    gain_reduction[i] = min(gain_reduction[i], target_gain)
-                else:
-                    gain_reduction[i] = target_gain
-                
-                # Apply gain reduction
-                output[i] = output[i] * gain_reduction[i]
+            if fallback_dsp.NUMBA_AVAILABLE:
+                # Limit in place with a scalar gain carried across samples
+                fallback_dsp.limiter(output.reshape(-1, output.shape[-1]), threshold_linear,
+                                     release_samples)
+            else:
+                # Without Numba use the closed form of the release: the gain
+                # reduction 1 - gain is the running maximum of each sample's
+                # own reduction decayed by (1 - 1 / release) per sample since
+                level = np.abs(output)
+                reduction = np.zeros(output.shape)
+                over = level > threshold_linear
+                reduction[over] = 1 - threshold_linear / level[over]
+                if release_samples > 1:
+                    # In logs the decay factors out of the running maximum
+                    ramp = np.arange(output.shape[-1]) * np.log1p(-1 / release_samples)
+                    with np.errstate(divide='ignore'):
+                        np.log(reduction, out=reduction)
+                    reduction -= ramp
+                    np.maximum.accumulate(reduction, axis=-1, out=reduction)
+                    reduction += ramp
+                    np.exp(reduction, out=reduction)
+                output *= 1 - reduction
             
             return output
             
@@ -898,32 +1322,27 @@ class AudioProcessor:
             logger.error(f"Error applying limiter: {str(e)}")
             return audio_data
     
-    def apply_distortion(self, audio_data, sample_rate, parameters):
-        """Apply distortion/saturation to audio data"""
+    def apply_distortion(self, audio_data, sample_rate, parameters, out=None):
+        """Apply distortion/saturation to audio data, writing into out when given"""
         try:
             # Extract parameters
             drive = parameters.get('drive', 2.0)
             mix = parameters.get('mix', 0.5)
             
-            # Apply soft clipping distortion
-            # Normalize input to prevent excessive distortion
-            normalized = audio_data / (np.max(np.abs(audio_data)) + 1e-10)
-            
-            # Apply drive
-            driven = normalized * drive
-            
-            # Apply soft clipping function (tanh)
-            distorted = np.tanh(driven)
+            # Apply soft clipping distortion to the input normalized to its
+            # peak, then restore the level; the normalization folds into the
+            # drive and wet gains, so the dry path is just a scale
+            input_peak = max(audio_data.max(), -audio_data.min()) + 1e-10
+            distorted = np.multiply(audio_data, drive / input_peak)
+            np.tanh(distorted, out=distorted)
+            distorted *= mix * input_peak
             
             # Mix with dry signal
-            output = (1 - mix) * normalized + mix * distorted
-            
-            # Normalize output level to match input level
-            output = output * (np.max(np.abs(audio_data)) + 1e-10)
+            output = np.multiply(audio_data, 1 - mix, out=out)
+            output += distorted
             
             # Prevent clipping
-            if np.max(np.abs(output)) > 0.99:
-                output = output / np.max(np.abs(output)) * 0.99
+            _peak_normalize(output)
                 
             return output
             
@@ -931,8 +1350,8 @@ class AudioProcessor:
             logger.error(f"Error applying distortion: {str(e)}")
             return audio_data
     
-    def apply_filter(self, audio_data, sample_rate, parameters):
-        """Apply filter effects to audio data"""
+    def apply_filter(self, audio_data, sample_rate, parameters, out=None):
+        """Apply filter effects to audio data, writing into out when given"""
         try:
             # Extract parameters
             filter_type = parameters.get('type', 'bandpass')
@@ -940,21 +1359,21 @@ class AudioProcessor:
             cutoff_high = parameters.get('cutoff_high', 3000)
             resonance = parameters.get('resonance', 0.7)
             
-            # Normalize cutoff frequencies
-            nyquist = sample_rate / 2
-            low_normalized = cutoff_low / nyquist
-            high_normalized = cutoff_high / nyquist
-            
-            # Design filter based on type
+            # Design filter based on type, as second-order sections so
+            # narrow low bands stay stable in float32
             if filter_type == 'lowpass':
-                b, a = signal.butter(2, high_normalized, btype='lowpass')
+                sos = _design_butter(2, cutoff_high, 'lowpass', sample_rate)
             elif filter_type == 'highpass':
-                b, a = signal.butter(2, low_normalized, btype='highpass')
+                sos = _design_butter(2, cutoff_low, 'highpass', sample_rate)
             else:  # bandpass
-                b, a = signal.butter(2, [low_normalized, high_normalized], btype='bandpass')
+                sos = _design_butter(2, (cutoff_low, cutoff_high), 'bandpass', sample_rate)
             
-            # Apply filter
-            output = signal.lfilter(b, a, audio_data)
+            # Apply filter in the input's precision
+            if out is None:
+                out = np.empty(audio_data.shape, dtype=np.result_type(audio_data.dtype, np.float32))
+            sos = sos.astype(out.dtype)
+            output = self._per_channel(
+                lambda channel, channel_out: _sosfilt_into(sos, channel, channel_out), audio_data, out)
             
             return output
             
@@ -962,8 +1381,8 @@ class AudioProcessor:
             logger.error(f"Error applying filter: {str(e)}")
             return audio_data
     
-    def apply_gate(self, audio_data, sample_rate, parameters):
-        """Apply noise gate to audio data"""
+    def apply_gate(self, audio_data, sample_rate, parameters, out=None):
+        """Apply noise gate to audio data, writing into out when given"""
         try:
             # Extract parameters
             threshold_db = parameters.get('threshold', -40)
@@ -980,35 +1399,19 @@ class AudioProcessor:
             attack_samples = max(1, attack_samples)
             release_samples = max(1, release_samples)
             
-            # Initialize gain and output arrays
-            gain = np.ones_like(audio_data)
-            output = np.zeros_like(audio_data)
-            
-            # Apply gate sample by sample
-            for i in range(len(audio_data)):
-                # Calculate instantaneous gain
-                input_level = np.abs(audio_data[i])
-                if input_level < threshold_linear:
-                    target_gain = (input_level / threshold_linear) ** ratio
-                else:
-                    target_gain = 1.0
-                
-                # Apply attack/release smoothing
-                if target_gain < gain[i-1] if i > 0 else 1.0:
-                    # Attack phase
-                    if i > 0:
-                        gain[i] = gain[i-1] + (target_gain - gain[i-1]) / attack_samples
-                    else:
-                        gain[i] = target_gain
-                else:
-                    # Release phase
-                    if i > 0:
-                        gain[i] = gain[i-1] + (target_gain - gain[i-1]) / release_samples
-                    else:
-                        gain[i] = target_gain
-                
-                # Apply gain
-                output[i] = audio_data[i] * gain[i]
+            output = _output_buffer(audio_data, out)
+            if fallback_dsp.NUMBA_AVAILABLE:
+                # Gate in place with a scalar gain carried across samples
+                fallback_dsp.gate(output.reshape(-1, output.shape[-1]), threshold_linear, ratio,
+                                  attack_samples, release_samples)
+            else:
+                # Without Numba approximate the envelope with two one-pole filters in C
+                level = np.abs(output)
+                target_gain = np.ones_like(output)
+                under = level < threshold_linear
+                target_gain[under] = (level[under] / threshold_linear) ** ratio
+                output *= np.minimum(_one_pole(target_gain, attack_samples),
+                                     _one_pole(target_gain, release_samples))
             
             return output
             
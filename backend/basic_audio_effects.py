@@ -2,11 +2,15 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
+
 import numpy as np
 from scipy import signal
 
 logger = logging.getLogger(__name__)
 
+_rng = np.random.default_rng()
+
 
 def apply_eq(audio_data, sample_rate, parameters):
     """Apply a simple EQ to the provided audio data."""
@@ -39,13 +43,10 @@ def apply_compression(audio_data, parameters):
         release = parameters.get('release', 50)
 
         threshold_linear = 10 ** (threshold / 20)
-        gain_reduction = np.zeros_like(audio_data)
-        for i in range(len(audio_data)):
-            if abs(audio_data[i]) > threshold_linear:
-                gain_reduction[i] = abs(audio_data[i]) / threshold_linear
-                gain_reduction[i] = gain_reduction[i] ** (1/ratio - 1)
-            else:
-                gain_reduction[i] = 1.0
+        level = np.abs(audio_data)
+        over = level > threshold_linear
+        gain_reduction = np.ones_like(audio_data)
+        gain_reduction[over] = (level[over] / threshold_linear) ** (1/ratio - 1)
 
         compressed_audio = audio_data * gain_reduction
         return compressed_audio
@@ -54,6 +55,16 @@ def apply_compression(audio_data, parameters):
         return audio_data
 
 
+@lru_cache(maxsize=16)
+def _impulse_response(room_size, damping, sample_rate):
+    """Synthesize the decaying noise burst for a reverb setting, memoized and read-only."""
+    reverb_time = int(room_size * sample_rate)
+    decay = np.linspace(1, 0, reverb_time) ** damping
+    impulse_response = decay * _rng.standard_normal(reverb_time)
+    impulse_response.flags.writeable = False
+    return impulse_response
+
+
 def apply_reverb(audio_data, sample_rate, parameters):
     """Apply a basic reverb effect."""
     try:
@@ -62,16 +73,13 @@ def apply_reverb(audio_data, sample_rate, parameters):
         wet_level = parameters.get('wet_level', 0.33)
         dry_level = parameters.get('dry_level', 0.4)
 
-        reverb_time = int(room_size * sample_rate)
-        impulse_response = np.zeros(reverb_time)
-        decay = np.linspace(1, 0, reverb_time) ** damping
-        impulse_response = decay * np.random.randn(reverb_time)
-
-        reverb_audio = signal.convolve(audio_data, impulse_response, mode='full')[:len(audio_data)]
+        impulse_response = _impulse_response(room_size, damping, sample_rate)
+        reverb_audio = signal.oaconvolve(audio_data, impulse_response, mode='full')[:len(audio_data)]
         output = dry_level * audio_data + wet_level * reverb_audio
 
-        if np.max(np.abs(output)) > 1.0:
-            output = output / np.max(np.abs(output))
+        peak = max(output.max(), -output.min())
+        if peak > 1.0:
+            output /= peak
         return output
     except Exception as e:
         logger.error(f"Error applying reverb: {str(e)}")
@@ -20,7 +20,7 @@ logger = logging.getLogger(__name__)
 # Import all components
 try:
     from audio_processing import audio_processor
-    from advanced_audio_effects import advanced_effects
+    from advanced_audio_effects import get_advanced_effects
     from audio_export import audio_exporter
     from cache_manager import cache_manager
     from parallel_processor import parallel_processor
@@ -71,6 +71,7 @@ class AudioChatSystem:
         
         # Check advanced effects
         if self.components_available:
+            advanced_effects = get_advanced_effects()
             status["advanced_effects_available"] = advanced_effects.pedalboard_available
             status["source_separation_available"] = advanced_effects.spleeter_available
             
@@ -272,7 +273,7 @@ class AudioChatSystem:
         Returns:
             Dictionary of source names to output paths
         """
-        if not self.components_available or not advanced_effects.spleeter_available:
+        if not self.components_available or not get_advanced_effects().spleeter_available:
             raise RuntimeError("Source separation not available")
         
         try:
@@ -288,7 +289,7 @@ class AudioChatSystem:
             y, sr = librosa.load(audio_path, sr=None)
             
             # Separate sources
-            sources = advanced_effects.separate_sources(y, sr, mode)
+            sources = get_advanced_effects().separate_sources(y, sr, mode)
             
             # Save each source
             result = {}
@@ -336,6 +337,7 @@ class AudioChatSystem:
                 "numpy": numpy.__version__
             }
             
+            advanced_effects = get_advanced_effects()
             if advanced_effects.pedalboard_available:
                 import pedalboard
                 self.status["versions"]["pedalboard"] = pedalboard.__version__
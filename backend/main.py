@@ -22,7 +22,7 @@ try:
     import soundfile as sf
     from pydub import AudioSegment
     from audio_processing import audio_processor
-    from advanced_audio_effects import advanced_effects
+    from advanced_audio_effects import get_advanced_effects
     from audio_export import audio_exporter
     from cache_manager import cache_manager
     from parallel_processor import parallel_processor
@@ -723,7 +723,7 @@ async def export_audio(
     Args:
         file_id: ID of the audio file to export
         format: Output format ('wav', 'mp3', 'flac', 'ogg', 'aac')
-        quality: Quality setting ('low', 'medium', 'high')
+        quality: Quality setting ('low', 'medium', 'high', or 'master' for WAV)
     """
     try:
         user_id = current_user["id"]
@@ -749,7 +749,7 @@ async def export_audio(
         y, sr = librosa.load(file_path, sr=None)
         
         # Export the audio in the requested format
-        export_result = audio_exporter.export_audio(
+        export_result = await audio_exporter.export_audio_async(
             audio_data=y,
             sample_rate=sr,
             file_id=f"export_{file_id}",
@@ -775,7 +775,8 @@ async def get_supported_formats():
             "qualities": [
                 {"id": "low", "name": "Low (16-bit)", "description": "16-bit PCM"},
                 {"id": "medium", "name": "Medium (24-bit)", "description": "24-bit PCM"},
-                {"id": "high", "name": "High (32-bit float)", "description": "32-bit floating point"}
+                {"id": "high", "name": "High (24-bit)", "description": "24-bit PCM"},
+                {"id": "master", "name": "Master (32-bit float)", "description": "32-bit floating point"}
             ]
         },
         {
@@ -783,9 +784,9 @@ async def get_supported_formats():
             "name": "MP3",
             "description": "Compressed audio format with good compatibility",
             "qualities": [
-                {"id": "low", "name": "Low (128kbps)", "description": "128kbps bitrate"},
-                {"id": "medium", "name": "Medium (192kbps)", "description": "192kbps bitrate"},
-                {"id": "high", "name": "High (320kbps)", "description": "320kbps bitrate"}
+                {"id": "low", "name": "Low (VBR ~130kbps)", "description": "LAME V5 variable bitrate"},
+                {"id": "medium", "name": "Medium (VBR ~175kbps)", "description": "LAME V3 variable bitrate"},
+                {"id": "high", "name": "High (VBR ~245kbps)", "description": "LAME V0 variable bitrate"}
             ]
         },
         {
@@ -802,9 +803,9 @@ async def get_supported_formats():
             "name": "OGG Vorbis",
             "description": "Free and open-source compressed audio format",
             "qualities": [
-                {"id": "low", "name": "Low (96kbps)", "description": "96kbps bitrate"},
-                {"id": "medium", "name": "Medium (160kbps)", "description": "160kbps bitrate"},
-                {"id": "high", "name": "High (256kbps)", "description": "256kbps bitrate"}
+                {"id": "low", "name": "Low (VBR q3)", "description": "Vorbis quality 3 variable bitrate"},
+                {"id": "medium", "name": "Medium (VBR q6)", "description": "Vorbis quality 6 variable bitrate"},
+                {"id": "high", "name": "High (VBR q10)", "description": "Vorbis quality 10 variable bitrate"}
             ]
         },
         {
@@ -851,7 +852,7 @@ async def separate_audio_sources(
         y, sr = librosa.load(original_file, sr=None)
         
         # Separate sources
-        sources = advanced_effects.separate_sources(y, sr, mode)
+        sources = get_advanced_effects().separate_sources(y, sr, mode)
         
         # Save each source as a separate file
         result = {
@@ -911,7 +912,7 @@ async def enhance_vocals(
         y, sr = librosa.load(original_file, sr=None)
         
         # Enhance vocals
-        enhanced = advanced_effects.enhance_vocals(y, sr, strength)
+        enhanced = get_advanced_effects().enhance_vocals(y, sr, strength)
         
         # Save the enhanced audio
         enhanced_id = str(uuid.uuid4())
@@ -958,7 +959,7 @@ async def isolate_instrument(
         y, sr = librosa.load(original_file, sr=None)
         
         # Isolate instrument
-        isolated = advanced_effects.isolate_instrument(y, sr, instrument)
+        isolated = get_advanced_effects().isolate_instrument(y, sr, instrument)
         
         # Save the isolated audio
         isolated_id = str(uuid.uuid4())
@@ -1005,7 +1006,7 @@ async def remove_instrument(
         y, sr = librosa.load(original_file, sr=None)
         
         # Remove instrument
-        processed = advanced_effects.remove_instrument(y, sr, instrument)
+        processed = get_advanced_effects().remove_instrument(y, sr, instrument)
         
         # Save the processed audio
         processed_id = str(uuid.uuid4())
@@ -1052,7 +1053,7 @@ async def denoise_audio(
         y, sr = librosa.load(original_file, sr=None)
         
         # Denoise audio
-        denoised = advanced_effects.denoise_audio(y, sr, strength)
+        denoised = get_advanced_effects().denoise_audio(y, sr, strength)
         
         # Save the denoised audio
         denoised_id = str(uuid.uuid4())
@@ -1102,7 +1103,7 @@ async def harmonize_audio(
         semitone_list = [int(s.strip()) for s in semitones.split(",")]
         
         # Harmonize audio
-        harmonized = advanced_effects.harmonize_audio(y, sr, semitone_list)
+        harmonized = get_advanced_effects().harmonize_audio(y, sr, semitone_list)
         
         # Save the harmonized audio
         harmonized_id = str(uuid.uuid4())
@@ -1124,6 +1125,7 @@ async def get_audio_capabilities():
     """
     Get available audio processing capabilities
     """
+    advanced_effects = get_advanced_effects()
     capabilities = {
         "pedalboard_available": advanced_effects.pedalboard_available,
         "spleeter_available": advanced_effects.spleeter_available,
@@ -1136,7 +1138,8 @@ async def get_audio_capabilities():
         "vocal_enhancement": advanced_effects.spleeter_available,
         "instrument_isolation": advanced_effects.spleeter_available,
         "denoising": advanced_effects.librosa_available,
-        "harmonization": advanced_effects.spleeter_available and advanced_effects.librosa_available,
+        "harmonization": advanced_effects.spleeter_available and (
+            advanced_effects.pedalboard_available or advanced_effects.librosa_available),
         "parallel_processing": True,
         "caching": True
     }
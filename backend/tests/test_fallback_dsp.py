@@ -0,0 +1,198 @@
+"""
+Tests for the fallback DSP kernels
+"""
+
+import unittest
+import os
+import sys
+import io
+import numpy as np
+import soundfile as sf
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import _fallback_dsp as fallback_dsp
+import audio_export
+
+def _quantize_reference(samples, bits):
+    """Scale, floor and clip float samples to left-aligned integers with NumPy"""
+    scale = np.float32(1 << (bits - 1))
+    scaled = np.clip(np.floor(samples.astype(np.float32) * scale), -scale, scale - 1)
+    return scaled.astype(np.int64) << (32 - bits if bits == 24 else 0)
+
+def _dynamics_reference(channel, target_gain, attack_samples, release_samples, limiter=False):
+    """Per-sample gain smoothing as the original Python effect loops ran it"""
+    output = channel.astype(np.float64)
+    gain = 1.0
+    for i in range(len(output)):
+        target = target_gain(abs(output[i]))
+        if i == 0:
+            gain = target
+        elif limiter:
+            gain = min(min(1.0, gain + (1.0 - gain) / release_samples), target)
+        elif target < gain:
+            gain += (target - gain) / attack_samples
+        else:
+            gain += (target - gain) / release_samples
+        output[i] *= gain
+    return output
+
+def _clipping_samples():
+    """Uniform samples past full scale plus the exact edges"""
+    samples = np.random.default_rng(2).uniform(-1.2, 1.2, 400000).astype(np.float32)
+    samples[:6] = [1.0, -1.0, 1.5, -1.5, 0.999999, -0.999999]
+    return samples
+
+@unittest.skipIf(not fallback_dsp.NUMBA_AVAILABLE, "Numba not available")
+class TestFallbackDSP(unittest.TestCase):
+    """Test cases for the Numba fallback kernels"""
+
+    def setUp(self):
+        """Create a planar stereo test buffer"""
+        rng = np.random.default_rng(0)
+        self.audio = (0.25 * rng.standard_normal((2, 4096))).astype(np.float32)
+
+    def test_apply_gain(self):
+        """Test that gain scales every sample"""
+        buf = self.audio.copy()
+        fallback_dsp.apply_gain(buf, 0.5)
+        np.testing.assert_allclose(buf, self.audio * 0.5, rtol=1e-6)
+
+    def test_biquad_matches_scipy(self):
+        """Test the biquad kernel against scipy.signal.lfilter"""
+        from scipy import signal
+
+        b0, b1, b2, a1, a2 = fallback_dsp.design_biquad('peak', 1000, 44100, gain_db=6.0)
+        expected = signal.lfilter([b0, b1, b2], [1.0, a1, a2], self.audio, axis=1)
+
+        buf = self.audio.copy()
+        fallback_dsp.biquad(buf, b0, b1, b2, a1, a2)
+        np.testing.assert_allclose(buf, expected, atol=1e-4)
+
+    def test_shelf_gain_at_dc(self):
+        """Test that a low shelf applies its full gain at DC"""
+        b0, b1, b2, a1, a2 = fallback_dsp.design_biquad('low_shelf', 250, 44100, gain_db=6.0)
+        dc_gain = (b0 + b1 + b2) / (1.0 + a1 + a2)
+        self.assertAlmostEqual(20 * np.log10(dc_gain), 6.0, places=3)
+
+    def test_soft_clip_bounds(self):
+        """Test that soft clipping keeps samples within [-1, 1]"""
+        buf = self.audio * 20
+        fallback_dsp.soft_clip(buf, 4.0)
+        self.assertLessEqual(np.max(np.abs(buf)), 1.0)
+
+    def test_comb_delay_dry(self):
+        """Test that a zero mix leaves the signal unchanged"""
+        buf = self.audio.copy()
+        fallback_dsp.comb_delay(buf, 100, 0.5, 0.0)
+        np.testing.assert_allclose(buf, self.audio)
+
+    def test_spectral_gate_matches_numpy(self):
+        """Test the spectral gate against a NumPy quantile threshold"""
+        rng = np.random.default_rng(1)
+        stft = (rng.standard_normal((64, 200)) + 1j * rng.standard_normal((64, 200))).astype(np.complex64)
+        magnitude = np.abs(stft)
+        threshold = np.quantile(magnitude, 0.05, axis=1, keepdims=True, method='lower') * 2.5
+        expected = np.where(magnitude <= threshold, 0, stft)
+
+        fallback_dsp.spectral_gate(stft, int(0.05 * 199), 2.5)
+        np.testing.assert_array_equal(stft, expected)
+
+    def test_compressor_matches_loop(self):
+        """Test the compressor kernel against the per-sample loop on each channel"""
+        threshold, ratio = 0.1, 4.0
+        def target_gain(level):
+            return (level / threshold) ** (1 / ratio - 1) if level > threshold else 1.0
+        for attack, release in ((20, 200), (1, 1)):
+            buf = self.audio.copy()
+            fallback_dsp.compressor(buf, threshold, 1 / ratio - 1, attack, release)
+            for channel, expected in zip(buf, self.audio):
+                reference = _dynamics_reference(expected, target_gain, attack, release)
+                np.testing.assert_allclose(channel, reference, atol=1e-5)
+
+    def test_limiter_matches_loop(self):
+        """Test the limiter kernel against the per-sample loop on each channel"""
+        threshold = 0.3
+        def target_gain(level):
+            return threshold / level if level > threshold else 1.0
+        for release in (100, 1):
+            buf = self.audio.copy()
+            fallback_dsp.limiter(buf, threshold, release)
+            for channel, expected in zip(buf, self.audio):
+                reference = _dynamics_reference(expected, target_gain, 1, release, limiter=True)
+                np.testing.assert_allclose(channel, reference, atol=1e-5)
+            self.assertLessEqual(np.abs(buf).max(), threshold + 1e-6)
+
+    def test_gate_matches_loop(self):
+        """Test the gate kernel against the per-sample loop on each channel"""
+        threshold, ratio = 0.2, 10
+        def target_gain(level):
+            return (level / threshold) ** ratio if level < threshold else 1.0
+        for attack, release in ((5, 100), (1, 1)):
+            buf = self.audio.copy()
+            fallback_dsp.gate(buf, threshold, ratio, attack, release)
+            for channel, expected in zip(buf, self.audio):
+                reference = _dynamics_reference(expected, target_gain, attack, release)
+                np.testing.assert_allclose(channel, reference, atol=1e-5)
+
+    def test_stereo_width_matches_mid_side(self):
+        """Test the stereo width kernel against a mid/side round trip"""
+        for width in (0.0, 1.0, 1.5):
+            mid = (self.audio[0] + self.audio[1]) / 2
+            side = (self.audio[0] - self.audio[1]) / 2 * width
+            buf = self.audio.copy()
+            fallback_dsp.stereo_width(buf, (1 + width) / 2, (1 - width) / 2)
+            np.testing.assert_allclose(buf, np.vstack((mid + side, mid - side)), atol=1e-6)
+
+    def test_quantize_pcm_matches_numpy(self):
+        """Test the fused quantizer against NumPy, including clipping past full scale"""
+        samples = _clipping_samples()
+        for bits, dtype in ((16, np.int16), (24, np.int32)):
+            out = np.empty(samples.shape, dtype=dtype)
+            fallback_dsp.quantize_pcm(samples, np.float32(1 << (bits - 1)),
+                                      32 - bits if bits == 24 else 0, out)
+            np.testing.assert_array_equal(out, _quantize_reference(samples, bits))
+
+class TestQuantize(unittest.TestCase):
+    """Test cases for the export quantizer against libsndfile's own conversion"""
+
+    def libsndfile_pcm(self, samples, subtype, dtype):
+        """Write float samples through libsndfile and read back the integers it stored"""
+        buffer = io.BytesIO()
+        sf.write(buffer, samples, 44100, format='WAV', subtype=subtype)
+        buffer.seek(0)
+        return sf.read(buffer, dtype=dtype)[0]
+
+    def test_pcm_16_matches_libsndfile(self):
+        """Test that 16-bit quantization is bit-identical to libsndfile"""
+        samples = _clipping_samples()
+        pcm = audio_export._quantize(samples, 'PCM_16')
+        self.assertEqual(pcm.dtype, np.int16)
+        np.testing.assert_array_equal(pcm, self.libsndfile_pcm(samples, 'PCM_16', 'int16'))
+
+    def test_pcm_24_within_one_lsb(self):
+        """Test that 24-bit quantization is within one LSB of libsndfile"""
+        samples = _clipping_samples()
+        pcm = audio_export._quantize(samples, 'PCM_24')
+        expected = self.libsndfile_pcm(samples, 'PCM_24', 'int32')
+        difference = (pcm.astype(np.int64) - expected) >> 8
+        self.assertLessEqual(np.abs(difference).max(), 1)
+        np.testing.assert_array_equal(pcm[:4] >> 8, [8388607, -8388608, 8388607, -8388608])
+
+    def test_numpy_path_matches_numba(self):
+        """Test that the NumPy fallback quantizes exactly like the Numba kernel"""
+        samples = _clipping_samples()
+        for subtype in ('PCM_16', 'PCM_24'):
+            expected = _quantize_reference(samples, 16 if subtype == 'PCM_16' else 24)
+            available = fallback_dsp.NUMBA_AVAILABLE
+            try:
+                fallback_dsp.NUMBA_AVAILABLE = False
+                numpy_pcm = audio_export._quantize(samples, subtype)
+            finally:
+                fallback_dsp.NUMBA_AVAILABLE = available
+            np.testing.assert_array_equal(numpy_pcm, expected)
+            np.testing.assert_array_equal(audio_export._quantize(samples, subtype), expected)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,7 +10,9 @@ import sys
 import unittest
 import tempfile
 import shutil
+import subprocess
 import numpy as np
+import soundfile as sf
 from pathlib import Path
 
 # Add parent directory to path to import modules
@@ -20,11 +22,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
     from integration import audio_chat_system
     from audio_processing import audio_processor
-    from advanced_audio_effects import advanced_effects
+    from advanced_audio_effects import AdvancedAudioEffects, get_advanced_effects
+    from audio_export import AudioExporter
     from cache_manager import cache_manager
     from parallel_processor import parallel_processor
     from llm_processor import llm_processor
     
+    advanced_effects = get_advanced_effects()
     COMPONENTS_AVAILABLE = True
 except ImportError as e:
     print(f"Error importing components: {str(e)}")
@@ -178,6 +182,33 @@ class TestAudioChatIntegration(unittest.TestCase):
             except Exception as e:
                 print(f"Export to {format} failed: {str(e)}")
     
+    def test_export_many(self):
+        """Test exporting several formats of one signal in parallel"""
+        audio_data, sample_rate = sf.read(str(self.test_audio_path), dtype='float32')
+        jobs = [{"audio_data": audio_data, "sample_rate": sample_rate, "file_id": f"many_{quality}",
+                 "format": "wav", "quality": quality} for quality in ("low", "high", "master")]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results = AudioExporter(Path(temp_dir)).export_many(jobs, max_workers=2)
+            
+            self.assertEqual([result["bit_depth"] for result in results], [16, 24, 32])
+            for result in results:
+                self.assertTrue(os.path.exists(result["path"]))
+    
+    @unittest.skipIf(not COMPONENTS_AVAILABLE or shutil.which('ffmpeg') is None, "ffmpeg not available")
+    def test_export_int16(self):
+        """Test that int16 audio reaches ffmpeg scaled to full-scale float"""
+        t = np.arange(44100) / 44100
+        audio_data = (0.5 * 32767 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = AudioExporter(Path(temp_dir)).export_audio(audio_data, 44100, "int16", "aac", "high")
+            decoded = subprocess.run(['ffmpeg', '-loglevel', 'error', '-i', result["path"],
+                                      '-f', 'f32le', 'pipe:1'], capture_output=True, check=True).stdout
+            
+            peak = np.abs(np.frombuffer(decoded, dtype=np.float32)).max()
+            self.assertAlmostEqual(peak, 0.5, delta=0.05)
+    
     def test_parallel_processing(self):
         """Test parallel processing"""
         # Create a longer test file
@@ -248,6 +279,22 @@ class TestAudioProcessor(unittest.TestCase):
         effect_types = [effect["type"] for effect in effects]
         self.assertIn("reverb", effect_types)
 
+    def test_limiter_without_numba(self):
+        """Test that the NumPy limiter matches the Numba kernel"""
+        from audio_processing import fallback_dsp
+        audio_data = (0.5 * np.random.default_rng(0).standard_normal((2, 44100))).astype(np.float32)
+        parameters = {"gain": 6, "threshold": -6, "release": 20}
+        
+        expected = audio_processor.apply_limiter(audio_data, 44100, parameters)
+        available = fallback_dsp.NUMBA_AVAILABLE
+        try:
+            fallback_dsp.NUMBA_AVAILABLE = False
+            output = audio_processor.apply_limiter(audio_data, 44100, parameters)
+        finally:
+            fallback_dsp.NUMBA_AVAILABLE = available
+        
+        np.testing.assert_allclose(output, expected, atol=1e-5)
+
 @unittest.skipIf(not COMPONENTS_AVAILABLE or not hasattr(advanced_effects, 'pedalboard_available') or 
                 not advanced_effects.pedalboard_available, 
                 "Pedalboard not available")
@@ -286,6 +333,124 @@ class TestAdvancedEffects(unittest.TestCase):
         
         # Check that output is different from input
         self.assertFalse(np.array_equal(processed_audio, audio_data))
+    
+    def test_eq(self):
+        """Test that EQ band gains are applied"""
+        sample_rate = 44100
+        audio_data = (0.1 * np.random.default_rng(0).standard_normal(sample_rate)).astype(np.float32)
+        
+        processed_audio = advanced_effects.process_with_pedalboard(
+            audio_data, sample_rate, [{"type": "eq", "parameters": {"low": 6, "high": 3}}])
+        
+        self.assertEqual(processed_audio.shape, audio_data.shape)
+        self.assertGreater(np.std(processed_audio), np.std(audio_data))
+    
+    def test_repeated_effect(self):
+        """Test that an effect repeated with identical parameters is applied twice"""
+        sample_rate = 44100
+        audio_data = (0.1 * np.random.default_rng(0).standard_normal(sample_rate)).astype(np.float32)
+        effects_chain = [{"type": "delay", "parameters": {"time": 0.05}}] * 2
+        
+        processed_audio = advanced_effects.process_with_pedalboard(audio_data, sample_rate, effects_chain)
+        expected = AdvancedAudioEffects(reuse_effects=False).process_with_pedalboard(
+            audio_data, sample_rate, effects_chain)
+        
+        self.assertFalse(np.array_equal(processed_audio, audio_data))
+        np.testing.assert_allclose(processed_audio, expected, atol=1e-6)
+    
+    def test_compiled_chain(self):
+        """Test that a compiled chain matches process_with_pedalboard"""
+        sample_rate = 44100
+        t = np.linspace(0, 1, sample_rate, endpoint=False)
+        audio_data = 0.5 * np.sin(2 * np.pi * 440 * t)
+        effects_chain = [{"type": "gain", "parameters": {"gain_db": -6}}]
+        
+        chain = advanced_effects.compile(effects_chain, sample_rate, channels=1)
+        processed_audio = chain.process(audio_data.reshape(1, -1))
+        
+        expected = advanced_effects.process_with_pedalboard(audio_data, sample_rate, effects_chain)
+        self.assertEqual(expected.shape, audio_data.shape)
+        np.testing.assert_allclose(processed_audio[0], expected, atol=1e-6)
+    
+    def test_stream_pedalboard(self):
+        """Test that streamed chunks match processing the whole buffer"""
+        sample_rate = 44100
+        audio_data = (0.1 * np.random.default_rng(0).standard_normal((2, sample_rate))).astype(np.float32)
+        effects_chain = [{"type": "delay", "parameters": {"time": 0.1}}]
+        
+        chunks = [audio_data[:, i:i + 4096] for i in range(0, sample_rate, 4096)]
+        streamed = np.concatenate(list(advanced_effects.stream_pedalboard(chunks, sample_rate, effects_chain)), axis=1)
+        
+        expected = advanced_effects.process_with_pedalboard(audio_data, sample_rate, effects_chain,
+                                                            layout='channels_samples')
+        np.testing.assert_allclose(streamed, expected, atol=1e-5)
+    
+    def test_process_stream(self):
+        """Test that a file streamed through a pitch shifter keeps its length and level"""
+        sample_rate = 44100
+        t = np.arange(4 * sample_rate) / sample_rate
+        audio_data = np.stack([0.3 * np.sin(2 * np.pi * 440 * t)] * 2, axis=1).astype(np.float32)
+        effects_chain = [{"type": "pitch_shift", "parameters": {"semitones": 4}}]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            in_path = os.path.join(temp_dir, "in.wav")
+            out_path = os.path.join(temp_dir, "out.wav")
+            sf.write(in_path, audio_data, sample_rate, subtype='FLOAT')
+            advanced_effects.process_stream(in_path, out_path, effects_chain, block_sec=1)
+            streamed, _ = sf.read(out_path, dtype='float32')
+        
+        expected = advanced_effects.process_with_pedalboard(audio_data, sample_rate, effects_chain)
+        self.assertEqual(streamed.shape, expected.shape)
+        # Block seams must not drop out: every 100 ms window keeps the batch level
+        window = sample_rate // 10
+        levels = [np.sqrt(np.mean(streamed[i:i + window] ** 2)) for i in range(0, len(streamed), window)]
+        self.assertGreater(min(levels), 0.8 * np.sqrt(np.mean(expected ** 2)))
+    
+    @unittest.skipIf(not COMPONENTS_AVAILABLE or not advanced_effects.fallback_dsp_available,
+                     "Fallback DSP kernels not available")
+    def test_process_stream_fallback(self):
+        """Test that block-wise fallback processing matches processing the whole file"""
+        sample_rate = 44100
+        audio_data = (0.1 * np.random.default_rng(0).standard_normal((3 * sample_rate, 2))).astype(np.float32)
+        effects_chain = [{"type": "delay", "parameters": {"time": 0.05}}, {"type": "reverb"}]
+        effects = AdvancedAudioEffects()
+        effects.pedalboard_available = False
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            in_path = os.path.join(temp_dir, "in.wav")
+            out_path = os.path.join(temp_dir, "out.wav")
+            sf.write(in_path, audio_data, sample_rate, subtype='FLOAT')
+            effects.process_stream(in_path, out_path, effects_chain, block_sec=1)
+            streamed, _ = sf.read(out_path, dtype='float32')
+        
+        expected = effects.process_with_pedalboard(audio_data, sample_rate, effects_chain)
+        np.testing.assert_allclose(streamed, expected, atol=1e-4)
+    
+    def test_stream_pedalboard_pitch_shift(self):
+        """Test that a pitch-shifted stream keeps every frame and does not drop out"""
+        sample_rate = 44100
+        t = np.arange(2 * sample_rate) / sample_rate
+        audio_data = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)[np.newaxis, :]
+        effects_chain = [{"type": "pitch_shift", "parameters": {"semitones": 4}}]
+        
+        chunks = [audio_data[:, i:i + 4096] for i in range(0, audio_data.shape[1], 4096)]
+        streamed = np.concatenate(list(advanced_effects.stream_pedalboard(chunks, sample_rate, effects_chain)), axis=1)
+        
+        self.assertEqual(streamed.shape, audio_data.shape)
+        window = sample_rate // 10
+        levels = [np.sqrt(np.mean(streamed[0, i:i + window] ** 2)) for i in range(0, streamed.shape[1], window)]
+        self.assertGreater(min(levels), 0.15)
+    
+    def test_compile_runner(self):
+        """Test that a generated runner keeps mono audio mono"""
+        sample_rate = 44100
+        audio_data = np.ones(sample_rate, dtype=np.float32)
+        
+        run = advanced_effects.compile_runner([{"type": "gain", "parameters": {"gain_db": -6}}])
+        processed_audio = run(audio_data, sample_rate)
+        
+        self.assertEqual(processed_audio.shape, audio_data.shape)
+        self.assertAlmostEqual(float(processed_audio[-1]), 10 ** (-6 / 20), places=4)
 
 @unittest.skipIf(not COMPONENTS_AVAILABLE, "AudioChat components not available")
 class TestCacheManager(unittest.TestCase):